@@ -0,0 +1,10 @@
+# Declarations used when Finance_Calculators.py is compiled with Cython, e.g.
+#   cythonize -3 -i Finance_Calculators.py
+# The .py file stays importable as plain Python; these types only apply to the
+# compiled module, where the investment and bond arithmetic runs on C doubles.
+cimport cython
+
+@cython.locals(rand_amount=double, interest_rate=double, invest_years=long,
+               converted_rate=double, current_value=double, months=long,
+               monthly_rate=double)
+cpdef main()
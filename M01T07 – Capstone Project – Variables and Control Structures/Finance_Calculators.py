@@ -13,6 +13,29 @@
    
 import math
 
+import numpy as np
+
+# Cython is optional too; cython.compiled is only True inside a build made with Finance_Calculators.pxd
+try:
+    import cython
+    CYTHON_BUILD = cython.compiled
+except ModuleNotFoundError:
+    CYTHON_BUILD = False
+
+# Numba is optional, without it the interest kernels below run as plain Python.
+# A Cython build has already compiled them, so Numba is not used there
+def njit(*args, **kwargs):
+    if args and callable(args[0]):
+        return args[0]
+    return lambda func: func
+prange = range
+
+if not CYTHON_BUILD:
+    try:
+        from numba import njit, prange
+    except ModuleNotFoundError:
+        pass
+
 #Function to safely get a valid float input
 def get_valid_float(prompt):
     while True:
@@ -29,52 +52,102 @@ def get_valid_int(prompt):
         except ValueError:
             print("Invalid input! Please enter a valid integer.")  
 
+# Accepted interest types
+INTEREST_TYPES = frozenset({"simple", "compound"})
+
 # Function to safely get a valid interest type input
 def get_valid_interest_type():
     while True:
         interest_type = input("Enter the interest type, simple or compound: ").strip().lower()
-        if interest_type == "simple" or interest_type == "compound":
+        if interest_type in INTEREST_TYPES:
             return interest_type 
         else:
             print("Invalid interest type input! Please enter either 'simple' or 'compound'.")
 
-# Loop until the user provides a valid calc_choice
-while True:
-    print("Investment - to calculate the amount of interest you'll earn on your investment.")
-    print("Bond       - to calculate the amount you'll have to pay on a home loan.")
+# Interest kernels, compiled by Numba so sweeps over many (rate, years) scenarios skip the interpreter.
+# They are compiled without fastmath, which would let LLVM approximate exp/log1p
+@njit(cache=True)
+def simple_interest(P, r, n):
+    return P * (1 + r * n)
+
+@njit(cache=True)
+def compound_interest(P, r, n):
+    # exp(n*log1p(r)) keeps the precision that 1 + r loses for small rates
+    return P * math.exp(n * math.log1p(r))
+
+# Function to calculate the total value for whole arrays of amounts, rates and years in parallel.
+# Only the fastmath flags that cannot change exp/log1p results (signed zeros, reciprocals) are allowed
+@njit(parallel=True, fastmath={"nsz", "arcp"}, cache=True)
+def batch_interest(P, r, n, compound):
+    totals = np.empty(P.shape[0])
+    for i in prange(P.shape[0]):
+        if compound:
+            totals[i] = compound_interest(P[i], r[i], n[i])
+        else:
+            totals[i] = simple_interest(P[i], r[i], n[i])
+    return totals
+
+INTEREST_KERNELS = {"simple": simple_interest, "compound": compound_interest}
+
+# Function to calculate the monthly bond repayment.
+# P, r_monthly and n can be single values or numpy arrays, so many scenarios are computed in one call
+def compute_repayment(P, r_monthly, n):
+    P = np.asarray(P, dtype=np.float64)
+    r_monthly = np.asarray(r_monthly, dtype=np.float64)
+    n = np.asarray(n, dtype=np.float64)
+    # At a 0% rate the annuity formula is 0/0; the repayment is then just P / n.
+    # Both branches are evaluated by np.where, so the 0/0 warning is silenced
+    with np.errstate(divide="ignore", invalid="ignore"):
+        repayment = np.where(r_monthly == 0, P / n, (r_monthly * P) / -np.expm1(-n * np.log1p(r_monthly)))
+    return repayment[()]  # Unwrap 0-d results back to a scalar
+
+# Function to build the outstanding bond balance after each month of the repayment term
+def amortization_schedule(P, r_monthly, n):
+    repayment = compute_repayment(P, r_monthly, n)
+    months_vec = np.arange(1, n + 1, dtype=np.float64)
+    # (1 + r)^k - 1 is evaluated once per month and shared by both terms of the balance
+    growth = np.expm1(months_vec * np.log1p(r_monthly))
+    # With no interest the balance simply falls by one repayment each month
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(r_monthly == 0, P - repayment * months_vec, P + (P - repayment / r_monthly) * growth)
+
+def main():
+    # Loop until the user provides a valid calc_choice
+    while True:
+        print("Investment - to calculate the amount of interest you'll earn on your investment.")
+        print("Bond       - to calculate the amount you'll have to pay on a home loan.")
     
-    calc_choice = input("Enter either 'investment' or 'bond' from the menu above to proceed: ").strip().lower()
+        calc_choice = input("Enter either 'investment' or 'bond' from the menu above to proceed: ").strip().lower()
 
-    if calc_choice == "investment":
-        # Get the necessary inputs with error handling
-        rand_amount = get_valid_float("Enter the rand amount you want to deposit: ")
-        interest_rate = get_valid_float("Enter the interest rate as a percentage: ")
-        invest_years = get_valid_int("Enter the number of years you want to invest: ")
+        if calc_choice == "investment":
+            # Get the necessary inputs with error handling
+            rand_amount = get_valid_float("Enter the rand amount you want to deposit: ")
+            interest_rate = get_valid_float("Enter the interest rate as a percentage: ")
+            invest_years = get_valid_int("Enter the number of years you want to invest: ")
         
-        # Get a valid interest type
-        interest_type = get_valid_interest_type()
+            # Get a valid interest type
+            interest_type = get_valid_interest_type()
+
+            converted_rate = interest_rate / 100
 
-        converted_rate = interest_rate / 100
+            total_rand_amount = INTEREST_KERNELS[interest_type](rand_amount, converted_rate, invest_years)
+            print(f"Your total investment rand value after {invest_years} years with {interest_type} interest will be: {total_rand_amount:.2f}")
+            break 
 
-        if interest_type == "simple":
-            total_rand_amount = rand_amount * (1 + converted_rate * invest_years)
-            print(f"Your total investment rand value after {invest_years} years with simple interest will be: {total_rand_amount:.2f}")
-        elif interest_type == "compound":
-            total_rand_amount = rand_amount * math.pow((1 + converted_rate), invest_years)
-            print(f"Your total investment rand value after {invest_years} years with compound interest will be: {total_rand_amount:.2f}")
-        break 
+        elif calc_choice == "bond":
+            # Get the necessary inputs with error handling
+            current_value = get_valid_float("Enter the current value of the house: ")
+            interest_rate = get_valid_float("Enter the interest rate as percentage: ")
+            months = get_valid_int("Enter the number of months you plan to pay for the bond: ")
 
-    elif calc_choice == "bond":
-        # Get the necessary inputs with error handling
-        current_value = get_valid_float("Enter the current value of the house: ")
-        interest_rate = get_valid_float("Enter the interest rate as percentage: ")
-        months = get_valid_int("Enter the number of months you plan to pay for the bond: ")
+            monthly_rate = interest_rate / 100 / 12
 
-        monthly_rate = interest_rate / 100 / 12
+            repayment = compute_repayment(current_value, monthly_rate, months)
+            print(f"Your monthly bond repayment is: {repayment:,.2f}")
+            break  
 
-        repayment = (monthly_rate * current_value) / (1 - math.pow(1 + monthly_rate, -months)) 
-        print(f"Your monthly bond repayment is: {repayment:,.2f}")
-        break  
+        else:
+            print("Invalid Calculator type, please enter either 'investment' or 'bond'.")
 
-    else:
-        print("Invalid Calculator type, please enter either 'investment' or 'bond'.")
+if __name__ == "__main__":
+    main()
@@ -37,40 +37,15 @@ Pseudocode Overview:
 '''
 
 # ===== Importing external modules ============
-from datetime import datetime
+from datetime import date
+import io
 import os
+import sys
+from task_utils import (show_welcome_page, hash_password, check_password, load_users, today_str,
+                        is_valid_due_date, format_task_line, append_line, close_writers, tasks_reader, task_rows,
+                        install_exit_handlers, QUIT_WORDS, YES_NO)
 
-# ===== Welcome Page Function =====
-def show_welcome_page():
-    '''
-    Displays a welcome banner. This function is called at program startup
-    and after a user logs out to re-display the banner.
-    '''
-    print("""
-====================================
-      WELCOME TO TASK MANAGER
-====================================
-""")
-
-# ===== Load Users Function =====
-def load_users():
-    '''Loads existing users from user.txt into a dictionary.'''
-    users = {}
-    if os.path.exists("user.txt"):
-        with open("user.txt", "r") as user_file:
-            for line in user_file:
-                try:
-                    username, password = line.strip().split(", ")
-                    users[username] = password
-                except ValueError:
-                    continue
-    else:
-        # If the file does not exist, create a default admin user
-        print("user.txt file is missing. Creating a default one with admin user.")
-        with open("user.txt", "w") as user_file:
-            user_file.write("admin, adm1n\n")
-        users["admin"] = "adm1n"
-    return users
+install_exit_handlers()  # Close the session writers if the terminal is closed or the process is killed
 
 # ===== Main Program Loop =====
 # This loop allows returning to the login screen after logging out.
@@ -80,10 +55,10 @@ while True:
     # ===== Login Section =====
     users = load_users()  # Load users from file
     while True:
-        username = input("Enter your username: ").strip()
+        username = sys.intern(input("Enter your username: ").strip())
         password = input("Enter your password: ").strip()
 
-        if username in users and users[username] == password:
+        if username in users and check_password(users[username], password):
             print(f"\nWelcome, {username}!")
             break
         else:
@@ -109,7 +84,7 @@ e - exit
 
             # Prompt for new user details with exit options
             new_username = input("Enter new username (or type 'q' or 'e' to quit): ").strip()
-            if new_username.lower() in ['q', 'e']:
+            if new_username.lower() in QUIT_WORDS:
                 if new_username.lower() == 'e':
                     print("Logging out...\n")
                     break
@@ -119,13 +94,13 @@ e - exit
                 continue
 
             new_password = input("Enter new password (or type 'q' or 'e' to quit): ").strip()
-            if new_password.lower() in ['q', 'e']:
+            if new_password.lower() in QUIT_WORDS:
                 if new_password.lower() == 'e':
                     print("Logging out...\n")
                     break
                 continue
             confirm_password = input("Confirm password (or type 'q' or 'e' to quit): ").strip()
-            if confirm_password.lower() in ['q', 'e']:
+            if confirm_password.lower() in QUIT_WORDS:
                 if confirm_password.lower() == 'e':
                     print("Logging out...\n")
                     break
@@ -137,16 +112,15 @@ e - exit
                 continue
 
             # Save new user
-            with open("user.txt", "a") as user_file:
-                user_file.write(f"{new_username}, {new_password}\n")
-            users[new_username] = new_password
+            users[new_username] = hash_password(new_password)
+            append_line("user.txt", f"{new_username}, {users[new_username]}\n")
             print("New user registered successfully.")
 
         elif menu == 'a':
             # Prompt for task details with quit option
             while True:
                 assigned_user = input("Enter the username the task is assigned to (or type 'q' or 'e' to quit): ").strip()
-                if assigned_user.lower() in ['q', 'e']:
+                if assigned_user.lower() in QUIT_WORDS:
                     if assigned_user.lower() == 'e':
                         print("Logging out...\n")
                         break
@@ -155,17 +129,17 @@ e - exit
                     print("User does not exist. Please re-enter a valid username.")
                     continue
                 break
-            if assigned_user.lower() in ['q', 'e']:
+            if assigned_user.lower() in QUIT_WORDS:
                 continue
 
             title = input("Enter the title of the task (or type 'q' or 'e' to quit): ").strip()
-            if title.lower() in ['q', 'e']:
+            if title.lower() in QUIT_WORDS:
                 if title.lower() == 'e':
                     print("Logging out...\n")
                     break
                 continue
             description = input("Enter the description of the task (or type 'q' or 'e' to quit): ").strip()
-            if description.lower() in ['q', 'e']:
+            if description.lower() in QUIT_WORDS:
                 if description.lower() == 'e':
                     print("Logging out...\n")
                     break
@@ -174,34 +148,32 @@ e - exit
             # Get due date and validate format
             while True:
                 due_date = input("Enter the due date (e.g. 25 Oct 2024) (or type 'q' or 'e' to quit): ").strip()
-                if due_date.lower() in ['q', 'e']:
+                if due_date.lower() in QUIT_WORDS:
                     if due_date.lower() == 'e':
                         print("Logging out...\n")
                         break
                     break
-                try:
-                    datetime.strptime(due_date, "%d %b %Y")
+                if is_valid_due_date(due_date):
                     break
-                except ValueError:
-                    print("Invalid date format. Please use 'DD Mon YYYY' format.")
+                print("Invalid date format. Please use 'DD Mon YYYY' format.")
             else:
                 continue
 
-            if due_date.lower() in ['q', 'e']:
+            if due_date.lower() in QUIT_WORDS:
                 continue
 
             # Ask if the task is completed
             while True:
-                completed = input("Is the task completed? (Yes/No): ").strip().capitalize()
-                if completed in ["Yes", "No"]:
+                completed = input("Is the task completed? (Yes/No): ").strip().lower()
+                if completed in YES_NO:
+                    completed = completed.capitalize()
                     break
                 print("Invalid input. Please enter 'Yes' or 'No'.")
 
-            assigned_date = datetime.today().strftime("%d %b %Y")
+            assigned_date = today_str(date.today().toordinal())
 
             # Write task to file
-            with open("tasks.txt", "a") as task_file:
-                task_file.write(f"{assigned_user}, {title}, {description}, {assigned_date}, {due_date}, {completed}\n")
+            append_line("tasks.txt", format_task_line([assigned_user, title, description, assigned_date, due_date, completed]))
             print("Task successfully added.")
 
         elif menu == 'va':
@@ -210,17 +182,19 @@ e - exit
                 print("No tasks found.")
                 continue
 
-            with open("tasks.txt", "r") as task_file:
-                found_task = False
-                for line in task_file:
-                    try:
-                        user, title, description, date_assigned, due_date, completed = line.strip().split(", ")
-                        print(f"\nTask: {title}\nAssigned to: {user}\nDate Assigned: {date_assigned}\nDue Date: {due_date}\nCompleted: {completed}\nDescription: {description}\n")
-                        found_task = True
-                    except ValueError:
-                        print("Malformed task entry. Skipping.")
-                if not found_task:
-                    print("No tasks to display.")
+            # Collect the output and write it to the terminal in one call
+            out = io.StringIO()
+            found_task = False
+            for row in task_rows(tasks_reader()):
+                try:
+                    user, title, description, date_assigned, due_date, completed = row
+                    out.write(f"\nTask: {title}\nAssigned to: {user}\nDate Assigned: {date_assigned}\nDue Date: {due_date}\nCompleted: {completed}\nDescription: {description}\n\n")
+                    found_task = True
+                except ValueError:
+                    out.write("Malformed task entry. Skipping.\n")
+            sys.stdout.write(out.getvalue())
+            if not found_task:
+                print("No tasks to display.")
 
         elif menu == 'vm':
             # View tasks assigned to the current user
@@ -228,16 +202,22 @@ e - exit
                 print("No tasks found.")
                 continue
 
+            # Only lines starting with "<username>, " reach the csv parser; the
+            # rest are skipped with a single startswith test
+            prefix = f"{username}, "
+            mine = (line for line in tasks_reader() if line.startswith(prefix))
+
+            # Collect the output and write it to the terminal in one call
+            out = io.StringIO()
             found = False
-            with open("tasks.txt", "r") as task_file:
-                for line in task_file:
-                    try:
-                        user, title, description, date_assigned, due_date, completed = line.strip().split(", ")
-                        if user == username:
-                            found = True
-                            print(f"\nTask: {title}\nAssigned to: {user}\nDate Assigned: {date_assigned}\nDue Date: {due_date}\nCompleted: {completed}\nDescription: {description}\n")
-                    except ValueError:
-                        continue
+            for row in task_rows(mine):
+                if len(row) != 6:
+                    continue  # Skip malformed entries
+                user, title, description, date_assigned, due_date, completed = row
+                found = True
+                out.write(f"\nTask: {title}\nAssigned to: {user}\nDate Assigned: {date_assigned}\nDue Date: {due_date}\nCompleted: {completed}\nDescription: {description}\n\n")
+
+            sys.stdout.write(out.getvalue())
 
             if not found:
                 print("No tasks assigned to you.")
@@ -249,3 +229,6 @@ e - exit
 
         else:
             print("Invalid input. Please select a valid option.")
+
+    # Sync and close this session's writers before returning to the login screen
+    close_writers()
@@ -42,43 +42,283 @@ Pseudocode Overview:
    - Try-except blocks for parsing and I/O.
 '''
 
-from datetime import datetime
+from array import array
+from dataclasses import dataclass
+from datetime import date
+import io
+import mmap
 import os
+import sys
+from task_utils import (show_welcome_page, hash_password, check_password, load_users, today_str,
+                        is_valid_due_date, format_task_line, append_line, close_writers, tasks_reader, close_tasks_reader,
+                        find_task_lines, task_rows, parse_task_line,
+                        install_exit_handlers, QUIT_WORDS, YES_NO)
+
+# ===== Task Line Index and Delete Functions =====
+def task_line_offsets():
+    # One pass over the memory-mapped file recording where each line starts, with
+    # the file size as the last entry, so line i is offsets[i]:offsets[i + 1]
+    offsets = array("Q", [0])
+    fd = tasks_reader().fileno()  # Flushes pending appends first
+    size = os.fstat(fd).st_size
+    if size == 0:
+        return offsets  # An empty file cannot be memory-mapped
+    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+        pos = mm.find(b"\n")
+        while pos != -1:
+            offsets.append(pos + 1)
+            pos = mm.find(b"\n", pos + 1)
+    if offsets[-1] != size:
+        offsets.append(size)  # Last line has no trailing newline
+    return offsets
+
+def delete_task_line(offsets, index):
+    # Removes line `index` (0-based) by copying the bytes before and after it into
+    # a temp file with os.sendfile, so no task text passes through Python
+    close_writers()  # The session append handle must not outlive the replaced file
+    start, end = offsets[index], offsets[index + 1]
+    with open("tasks.txt", "rb") as src:
+        size = os.fstat(src.fileno()).st_size
+        with open("tasks.tmp", "wb") as dst:
+            use_sendfile = hasattr(os, "sendfile")
+            for offset, count in ((0, start), (end, size - end)):
+                while count > 0:
+                    sent = 0
+                    if use_sendfile:
+                        try:
+                            sent = os.sendfile(dst.fileno(), src.fileno(), offset, count)
+                        except OSError:
+                            # e.g. macOS, whose sendfile only writes to sockets
+                            use_sendfile = False
+                    if not use_sendfile:
+                        # Platforms without a usable sendfile (e.g. Windows) copy through Python
+                        src.seek(offset)
+                        sent = dst.write(src.read(count))
+                    offset += sent
+                    count -= sent
+    close_tasks_reader()  # Neither may the cached read handle
+    os.replace("tasks.tmp", "tasks.txt")
+
+# ===== Menu Handler Functions =====
+# Each menu option is a function taking the logged-in Session. A handler
+# returns True when the user chose to log out, otherwise None.
+
+@dataclass
+class Session:
+    username: str
+    users: dict
+
+def handle_register(session):
+    users = session.users
+    new_username = input("Enter new username (or type 'q' or 'e' to quit): ").strip()
+    if new_username.lower() in QUIT_WORDS:
+        if new_username.lower() == 'e':
+            print("Logging out...\n")
+            return True  # Exit to login screen
+        return
+    if new_username in users:
+        print("Username already exists. Try again.")
+        return
+
+    new_password = input("Enter new password (or type 'q' or 'e' to quit): ").strip()
+    if new_password.lower() in QUIT_WORDS:
+        if new_password.lower() == 'e':
+            print("Logging out...\n")
+            return True
+        return
+
+    confirm_password = input("Confirm password (or type 'q' or 'e' to quit): ").strip()
+    if confirm_password.lower() in QUIT_WORDS:
+        if confirm_password.lower() == 'e':
+            print("Logging out...\n")
+            return True
+        return
+
+    if new_password != confirm_password:
+        print("Passwords do not match. Try again.")
+        return
+
+    # Add new user to file and dictionary
+    users[new_username] = hash_password(new_password)
+    append_line("user.txt", f"{new_username}, {users[new_username]}\n")
+    print("New user registered successfully.")
+
+def handle_add(session):
+    while True:
+        assigned_user = input("Enter the username the task is assigned to (or type 'q' or 'e' to quit): ").strip()
+        if assigned_user.lower() in QUIT_WORDS:
+            if assigned_user.lower() == 'e':
+                print("Logging out...\n")
+                break
+            break
+        if assigned_user not in session.users:
+            print("User does not exist. Please re-enter a valid username.")
+            continue
+        break
+    if assigned_user.lower() in QUIT_WORDS:
+        return
+
+    # Get task details
+    title = input("Enter the title of the task (or type 'q' or 'e' to quit): ").strip()
+    if title.lower() in QUIT_WORDS:
+        if title.lower() == 'e':
+            print("Logging out...\n")
+            return True
+        return
+    description = input("Enter the description of the task (or type 'q' or 'e' to quit): ").strip()
+    if description.lower() in QUIT_WORDS:
+        if description.lower() == 'e':
+            print("Logging out...\n")
+            return True
+        return
+
+    # Validate due date
+    while True:
+        due_date = input("Enter the due date (e.g. 25 Oct 2024) (or type 'q' or 'e' to quit): ").strip()
+        if due_date.lower() in QUIT_WORDS:
+            if due_date.lower() == 'e':
+                print("Logging out...\n")
+                break
+            break
+        if is_valid_due_date(due_date):  # Check format
+            break
+        print("Invalid date format. Please use 'DD Mon YYYY' format.")
+    if due_date.lower() in QUIT_WORDS:
+        return
 
-# ===== Welcome Page Function =====
-def show_welcome_page():
-    # Print the welcome banner
-    print("""
-====================================
-      WELCOME TO TASK MANAGER
-====================================
-""")
-
-# ===== Load Users Function =====
-def load_users():
-    users = {}  # Dictionary to store username:password pairs
-
-    # Check if user.txt exists
-    if os.path.exists("user.txt"):
-        with open("user.txt", "r") as user_file:
-            for line in user_file:
-                try:
-                    # Split each line into username and password
-                    username, password = line.strip().split(", ")
-                    users[username] = password
-                except ValueError:
-                    # Skip malformed lines
-                    continue
-    else:
-        # If file doesn't exist, create one with default admin user
-        print("user.txt file is missing. Creating a default one with admin user.")
-        with open("user.txt", "w") as user_file:
-            user_file.write("admin, adm1n\n")
-        users["admin"] = "adm1n"
-    
-    return users  # Return the loaded users
+    # Ask if task is completed
+    while True:
+        completed = input("Is the task completed? (Yes/No): ").strip().lower()
+        if completed in YES_NO:
+            completed = completed.capitalize()
+            break
+        print("Invalid input. Please enter 'Yes' or 'No'.")
+
+    assigned_date = today_str(date.today().toordinal())  # Get today's date
+
+    # Write task to file
+    append_line("tasks.txt", format_task_line([assigned_user, title, description, assigned_date, due_date, completed]))
+    print("Task successfully added.")
+
+def handle_view_all(session):
+    if not os.path.exists("tasks.txt"):
+        print("No tasks found.")
+        return
+
+    # Collect the output and write it to the terminal in one call
+    out = io.StringIO()
+    found_task = False
+    for row in task_rows(tasks_reader()):
+        try:
+            user, title, description, date_assigned, due_date, completed = row
+            out.write(f"\nTask: {title}\nAssigned to: {user}\nDate Assigned: {date_assigned}\nDue Date: {due_date}\nCompleted: {completed}\nDescription: {description}\n\n")
+            found_task = True
+        except ValueError:
+            out.write("Malformed task entry. Skipping.\n")
+    sys.stdout.write(out.getvalue())
+    if not found_task:
+        print("No tasks to display.")
+
+def handle_view_mine(session):
+    if not os.path.exists("tasks.txt"):
+        print("No tasks found.")
+        return
+
+    # Only lines starting with "<username>, " are parsed
+    out = io.StringIO()
+    found = False
+    for row in task_rows(find_task_lines(f"{session.username}, ".encode("utf-8"))):
+        if len(row) != 6:
+            continue  # Skip malformed entries
+        user, title, description, date_assigned, due_date, completed = row
+        found = True
+        out.write(f"\nTask: {title}\nAssigned to: {user}\nDate Assigned: {date_assigned}\nDue Date: {due_date}\nCompleted: {completed}\nDescription: {description}\n\n")
+    sys.stdout.write(out.getvalue())
+    if not found:
+        print("No tasks assigned to you.")
+
+def handle_view_completed(session):
+    if not os.path.exists("tasks.txt"):
+        print("No tasks found.")
+        return
+
+    # Every line is parsed: the completed flag is matched case-insensitively
+    # ("Yes", "yes", "YES"), which a byte-level pre-filter cannot do
+    out = io.StringIO()
+    found = False
+    for row in task_rows(tasks_reader()):
+        if len(row) != 6:
+            continue  # Skip malformed entries
+        user, title, description, date_assigned, due_date, completed = row
+        if completed.lower() != "yes":
+            continue
+        found = True
+        out.write(f"\nTask: {title}\nAssigned to: {user}\nDate Assigned: {date_assigned}\nDue Date: {due_date}\nCompleted: {completed}\nDescription: {description}\n\n")
+    sys.stdout.write(out.getvalue())
+    if not found:
+        print("No completed tasks found.")
+
+def handle_delete(session):
+    if not os.path.exists("tasks.txt"):
+        print("No tasks available to delete.")
+        return
+
+    # Line start offsets give the task count and let the chosen line be cut out
+    # without holding every task in memory. The list is numbered from the same
+    # spans, so task N on screen is exactly the line delete_task_line removes
+    offsets = task_line_offsets()
+    task_count = len(offsets) - 1
+    if task_count == 0:
+        print("No tasks available to delete.")
+        return
+
+    # Display tasks with numbers
+    with open("tasks.txt", "rb") as task_file, \
+            mmap.mmap(task_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for i in range(task_count):
+            task = parse_task_line(mm[offsets[i]:offsets[i + 1]].decode("utf-8"))
+            if len(task) == 6:
+                user, title, description, date_assigned, due_date, completed = task
+                print(f"{i + 1}. Task: {title} | Assigned to: {user} | Due: {due_date} | Completed: {completed}")
+            else:
+                print(f"{i + 1}. [Malformed task entry]")
+
+    # Prompt user to choose task to delete
+    try:
+        task_num = int(input("Enter the task number to delete (or 0 to cancel): "))
+        if task_num == 0:
+            return
+        if 1 <= task_num <= task_count:
+            delete_task_line(offsets, task_num - 1)  # Remove the selected task
+            print("Task deleted successfully.")
+        else:
+            print("Invalid task number.")
+    except ValueError:
+        print("Please enter a valid number.")
+
+def handle_exit(session):
+    print("Logging out...\n")
+    return True
+
+def handle_invalid(session):
+    print("Invalid input. Please select a valid option.")
+
+# Menu option -> handler, built once; admins get the extra options
+USER_DISPATCH = {
+    'a': handle_add,
+    'va': handle_view_all,
+    'vm': handle_view_mine,
+    'e': handle_exit,
+}
+ADMIN_DISPATCH = {
+    **USER_DISPATCH,
+    'r': handle_register,
+    'vc': handle_view_completed,
+    'del': handle_delete,
+}
 
 # ===== Main Program Loop =====
+install_exit_handlers()  # Close the session writers if the terminal is closed or the process is killed
 while True:
     show_welcome_page()  # Display welcome banner
 
@@ -86,16 +326,19 @@ while True:
     users = load_users()  # Load user credentials from file
 
     while True:
-        username = input("Enter your username: ").strip()
+        username = sys.intern(input("Enter your username: ").strip())
         password = input("Enter your password: ").strip()
 
         # Validate login
-        if username in users and users[username] == password:
+        if username in users and check_password(users[username], password):
             print(f"\nWelcome, {username}!")
             break  # Successful login
         else:
             print("Invalid username or password. Please try again.\n")
 
+    session = Session(username, users)
+    dispatch = ADMIN_DISPATCH if username == "admin" else USER_DISPATCH
+
     # ===== Main Menu =====
     while True:
         # Display menu based on whether user is admin
@@ -119,197 +362,9 @@ vm - view my tasks
 e - exit
 Enter selection: ''').lower()
 
-        # ===== Register New User (Admin Only) =====
-        if menu == 'r' and username == 'admin':
-            new_username = input("Enter new username (or type 'q' or 'e' to quit): ").strip()
-            if new_username.lower() in ['q', 'e']:
-                if new_username.lower() == 'e':
-                    print("Logging out...\n")
-                    break  # Exit to login screen
-                continue
-            if new_username in users:
-                print("Username already exists. Try again.")
-                continue
-
-            new_password = input("Enter new password (or type 'q' or 'e' to quit): ").strip()
-            if new_password.lower() in ['q', 'e']:
-                if new_password.lower() == 'e':
-                    print("Logging out...\n")
-                    break
-                continue
-
-            confirm_password = input("Confirm password (or type 'q' or 'e' to quit): ").strip()
-            if confirm_password.lower() in ['q', 'e']:
-                if confirm_password.lower() == 'e':
-                    print("Logging out...\n")
-                    break
-                continue
-
-            if new_password != confirm_password:
-                print("Passwords do not match. Try again.")
-                continue
-
-            # Add new user to file and dictionary
-            with open("user.txt", "a") as user_file:
-                user_file.write(f"{new_username}, {new_password}\n")
-            users[new_username] = new_password
-            print("New user registered successfully.")
-
-        # ===== Add Task =====
-        elif menu == 'a':
-            while True:
-                assigned_user = input("Enter the username the task is assigned to (or type 'q' or 'e' to quit): ").strip()
-                if assigned_user.lower() in ['q', 'e']:
-                    if assigned_user.lower() == 'e':
-                        print("Logging out...\n")
-                        break
-                    break
-                if assigned_user not in users:
-                    print("User does not exist. Please re-enter a valid username.")
-                    continue
-                break
-            if assigned_user.lower() in ['q', 'e']:
-                continue
-
-            # Get task details
-            title = input("Enter the title of the task (or type 'q' or 'e' to quit): ").strip()
-            if title.lower() in ['q', 'e']:
-                if title.lower() == 'e':
-                    print("Logging out...\n")
-                    break
-                continue
-            description = input("Enter the description of the task (or type 'q' or 'e' to quit): ").strip()
-            if description.lower() in ['q', 'e']:
-                if description.lower() == 'e':
-                    print("Logging out...\n")
-                    break
-                continue
-
-            # Validate due date
-            while True:
-                due_date = input("Enter the due date (e.g. 25 Oct 2024) (or type 'q' or 'e' to quit): ").strip()
-                if due_date.lower() in ['q', 'e']:
-                    if due_date.lower() == 'e':
-                        print("Logging out...\n")
-                        break
-                    break
-                try:
-                    datetime.strptime(due_date, "%d %b %Y")  # Check format
-                    break
-                except ValueError:
-                    print("Invalid date format. Please use 'DD Mon YYYY' format.")
-            else:
-                continue
-            if due_date.lower() in ['q', 'e']:
-                continue
-
-            # Ask if task is completed
-            while True:
-                completed = input("Is the task completed? (Yes/No): ").strip().capitalize()
-                if completed in ["Yes", "No"]:
-                    break
-                print("Invalid input. Please enter 'Yes' or 'No'.")
-
-            assigned_date = datetime.today().strftime("%d %b %Y")  # Get today's date
-
-            # Write task to file
-            with open("tasks.txt", "a") as task_file:
-                task_file.write(f"{assigned_user}, {title}, {description}, {assigned_date}, {due_date}, {completed}\n")
-            print("Task successfully added.")
-
-        # ===== View All Tasks =====
-        elif menu == 'va':
-            if not os.path.exists("tasks.txt"):
-                print("No tasks found.")
-                continue
-
-            with open("tasks.txt", "r") as task_file:
-                found_task = False
-                for line in task_file:
-                    try:
-                        user, title, description, date_assigned, due_date, completed = line.strip().split(", ")
-                        print(f"\nTask: {title}\nAssigned to: {user}\nDate Assigned: {date_assigned}\nDue Date: {due_date}\nCompleted: {completed}\nDescription: {description}\n")
-                        found_task = True
-                    except ValueError:
-                        print("Malformed task entry. Skipping.")
-                if not found_task:
-                    print("No tasks to display.")
-
-        # ===== View My Tasks =====
-        elif menu == 'vm':
-            if not os.path.exists("tasks.txt"):
-                print("No tasks found.")
-                continue
-
-            found = False
-            with open("tasks.txt", "r") as task_file:
-                for line in task_file:
-                    try:
-                        user, title, description, date_assigned, due_date, completed = line.strip().split(", ")
-                        if user == username:
-                            found = True
-                            print(f"\nTask: {title}\nAssigned to: {user}\nDate Assigned: {date_assigned}\nDue Date: {due_date}\nCompleted: {completed}\nDescription: {description}\n")
-                    except ValueError:
-                        continue
-            if not found:
-                print("No tasks assigned to you.")
-
-        # ===== View Completed Tasks (Admin Only) =====
-        elif menu == 'vc' and username == 'admin':
-            if not os.path.exists("tasks.txt"):
-                print("No tasks found.")
-                continue
-
-            found = False
-            with open("tasks.txt", "r") as task_file:
-                for line in task_file:
-                    try:
-                        user, title, description, date_assigned, due_date, completed = line.strip().split(", ")
-                        if completed.lower() == "yes":
-                            found = True
-                            print(f"\nTask: {title}\nAssigned to: {user}\nDate Assigned: {date_assigned}\nDue Date: {due_date}\nCompleted: {completed}\nDescription: {description}\n")
-                    except ValueError:
-                        continue
-            if not found:
-                print("No completed tasks found.")
-
-        # ===== Delete Tasks (Admin Only) =====
-        elif menu == 'del' and username == 'admin':
-            if not os.path.exists("tasks.txt"):
-                print("No tasks available to delete.")
-                continue
-
-            with open("tasks.txt", "r") as file:
-                tasks = file.readlines()
-
-            # Display tasks with numbers
-            for i, task in enumerate(tasks, 1):
-                try:
-                    user, title, description, date_assigned, due_date, completed = task.strip().split(", ")
-                    print(f"{i}. Task: {title} | Assigned to: {user} | Due: {due_date} | Completed: {completed}")
-                except ValueError:
-                    print(f"{i}. [Malformed task entry]")
-
-            # Prompt user to choose task to delete
-            try:
-                task_num = int(input("Enter the task number to delete (or 0 to cancel): "))
-                if task_num == 0:
-                    continue
-                if 1 <= task_num <= len(tasks):
-                    deleted = tasks.pop(task_num - 1)  # Remove the selected task
-                    with open("tasks.txt", "w") as file:
-                        file.writelines(tasks)
-                    print("Task deleted successfully.")
-                else:
-                    print("Invalid task number.")
-            except ValueError:
-                print("Please enter a valid number.")
-
-        # ===== Exit Program =====
-        elif menu == 'e':
-            print("Logging out...\n")
+        # Look up the handler for the selected option
+        if dispatch.get(menu, handle_invalid)(session):
             break
 
-        # ===== Invalid Input =====
-        else:
-            print("Invalid input. Please select a valid option.")
+    # Sync and close this session's writers before returning to the login screen
+    close_writers()
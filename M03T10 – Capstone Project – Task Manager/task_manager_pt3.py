@@ -18,37 +18,91 @@ PSEUDOCODE FOR TASK MANAGER:
     - Execute selected menu functions.
     - On exit, show goodbye and return to welcome screen.
 """
-from datetime import datetime
+from datetime import date
+from functools import lru_cache
+import io
 import os
-
-# ===== Welcome Page Function =====
-def show_welcome_page():
-    # Displays a welcome banner
-    print("""
-====================================
-      WELCOME TO TASK MANAGER
-====================================
-""")
-
-# ===== Load Users Function =====
-def load_users():
-    # Loads user credentials from user.txt into a dictionary
-    users = {}
-    if os.path.exists("user.txt"):
-        with open("user.txt", "r") as user_file:
-            for line in user_file:
-                try:
-                    username, password = line.strip().split(", ")
-                    users[username] = password
-                except ValueError:
-                    continue  # Skip lines that don't have exactly two parts
-    else:
-        # Create default admin user if file doesn't exist
-        print("user.txt file is missing. Creating a default one with admin user.")
-        with open("user.txt", "w") as user_file:
-            user_file.write("admin, adm1n\n")
-        users["admin"] = "adm1n"
-    return users
+import sqlite3
+import sys
+from task_utils import (show_welcome_page, hash_password, check_password, load_users,
+                        is_valid_due_date, append_line, close_writers, replace_file, task_rows,
+                        ensure_utf8, install_exit_handlers)
+
+# ===== Task Database Functions =====
+TASKS_DB = "tasks.db"
+_conn = None  # One connection kept open for the whole run
+
+def get_tasks_db():
+    # Opens tasks.db on first use and reuses the connection afterwards
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(TASKS_DB)
+    return _conn
+
+def init_tasks_db():
+    # Creates the tasks table with indexes for the per-user and overdue lookups.
+    # When the table is first created, tasks from an existing tasks.txt are imported
+    conn = get_tasks_db()
+    new_db = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks'").fetchone() is None
+    with conn:
+        # DDL does not open a transaction implicitly, so begin one explicitly: if the
+        # import fails, the table creation is rolled back too and the next run retries
+        conn.execute("BEGIN")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id          INTEGER PRIMARY KEY,
+                username    TEXT NOT NULL,
+                title       TEXT NOT NULL,
+                description TEXT NOT NULL,
+                assigned    DATE NOT NULL,
+                due         DATE NOT NULL,
+                completed   INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_user ON tasks(username)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_completed_due ON tasks(completed, due)")
+        if new_db and os.path.exists("tasks.txt"):
+            rows = []
+            skipped = 0
+            ensure_utf8("tasks.txt")
+            with open("tasks.txt", "r", encoding="utf-8", newline="") as task_file:
+                for row in task_rows(task_file):
+                    if row == [""] or not row:
+                        continue  # Blank line
+                    try:
+                        user, title, description, assigned, due, completed = row
+                        rows.append((user, title, description, to_iso(assigned), to_iso(due), int(completed.lower() == "yes")))
+                    except ValueError:
+                        skipped += 1  # Malformed entry or invalid date
+            conn.executemany(
+                "INSERT INTO tasks (username, title, description, assigned, due, completed) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            print(f"Imported {len(rows)} tasks from tasks.txt.")
+            if skipped:
+                print(f"Skipped {skipped} malformed task entries in tasks.txt; they were not imported.")
+
+# ===== Date Conversion Functions =====
+# Tasks store ISO dates (YYYY-MM-DD), which compare correctly as plain strings,
+# so the overdue check in SQL needs no date parsing. Conversions to and from
+# the "25 Oct 2024" display form are done with a month table instead of
+# strptime/strftime, and memoized since the same dates repeat across tasks
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+_MONTH_NUMBERS = {name.lower(): number for number, name in enumerate(_MONTHS, 1)}
+
+@lru_cache(maxsize=4096)
+def to_iso(display_date):
+    # "25 Oct 2024" -> "2024-10-25"; raises ValueError for anything that is not a real date
+    if not is_valid_due_date(display_date):
+        raise ValueError(f"Invalid date: {display_date!r}")
+    day, month, year = display_date.split()
+    return f"{year}-{_MONTH_NUMBERS[month.lower()]:02d}-{int(day):02d}"
+
+@lru_cache(maxsize=4096)
+def from_iso(iso_date):
+    # "2024-10-25" -> "25 Oct 2024" for display
+    year, month, day = iso_date.split("-")
+    return f"{day} {_MONTHS[int(month) - 1]} {year}"
 
 # ===== Register User Function =====
 def reg_user(users):
@@ -65,9 +119,8 @@ def reg_user(users):
             return
         confirm_pass = input("Confirm password: ").strip()
         if new_pass == confirm_pass:
-            with open("user.txt", "a") as user_file:
-                user_file.write(f"{new_user}, {new_pass}\n")
-            users[new_user] = new_pass
+            users[new_user] = hash_password(new_pass)
+            append_line("user.txt", f"{new_user}, {users[new_user]}\n")
             print("User registered successfully.")
             return
         else:
@@ -87,72 +140,65 @@ def add_task(users):
         description = input("Enter task description: ")
         while True:
             due_date_str = input("Enter due date (e.g., 25 Oct 2024): ")
-            try:
-                datetime.strptime(due_date_str, "%d %b %Y")
+            if is_valid_due_date(due_date_str):
                 break
-            except ValueError:
-                print("Incorrect format. Please use 'DD Mon YYYY' (e.g., 25 Oct 2024).")
-        assigned_date = datetime.today().strftime("%d %b %Y")
-        completed = input("Is the task completed? (Yes/No): ").capitalize()
-        if completed not in ["Yes", "No"]:
-            completed = "No"
-        with open("tasks.txt", "a") as task_file:
-            task_file.write(f"{task_user}, {title}, {description}, {assigned_date}, {due_date_str}, {completed}\n")
+            print("Incorrect format. Please use 'DD Mon YYYY' (e.g., 25 Oct 2024).")
+        assigned_date = date.today().isoformat()
+        completed = input("Is the task completed? (Yes/No): ").strip().lower()
+        with get_tasks_db() as conn:
+            conn.execute(
+                "INSERT INTO tasks (username, title, description, assigned, due, completed) VALUES (?, ?, ?, ?, ?, ?)",
+                (task_user, title, description, assigned_date, to_iso(due_date_str), int(completed == "yes")),
+            )
         print("Task added successfully.")
         return
 
 # ===== View All Tasks Function =====
 def view_all():
-    # Displays all tasks from the file
-    if not os.path.exists("tasks.txt"):
-        print("No tasks found.")
-        return
-    with open("tasks.txt", "r") as task_file:
-        tasks = task_file.readlines()
-        if not tasks:
-            print("No tasks found.")
-            return
-        for task in tasks:
-            task_parts = task.strip().split(", ")
-            if len(task_parts) != 6:
-                continue
-            print(f"""
-Task: {task_parts[1]}
-Assigned to: {task_parts[0]}
-Date Assigned: {task_parts[3]}
-Due Date: {task_parts[4]}
-Task Complete? {task_parts[5]}
+    # Displays all tasks from the database, streaming rows from the cursor
+    # Collect the output and write it to the terminal in one call
+    out = io.StringIO()
+    for user, title, description, assigned, due, completed in get_tasks_db().execute(
+        "SELECT username, title, description, assigned, due, completed FROM tasks ORDER BY id"
+    ):
+        out.write(f"""
+Task: {title}
+Assigned to: {user}
+Date Assigned: {from_iso(assigned)}
+Due Date: {from_iso(due)}
+Task Complete? {"Yes" if completed else "No"}
 Description:
-{task_parts[2]}
+{description}
+
 """)
+    if not out.tell():
+        print("No tasks found.")
+        return
+    sys.stdout.write(out.getvalue())
 
-# ===== Recursive function for valid task number input =====
+# ===== Valid Task Number Input Function =====
 def get_valid_task_number(max_task_num):
-    # Ensures the user inputs a valid task number
-    try:
-        choice = int(input(f"Select a task number to edit/mark complete (or -1 to return to main menu): "))
-        if choice == -1:
-            return -1
-        if 1 <= choice <= max_task_num:
+    # Ensures the user inputs a valid task number, re-prompting in a loop
+    while True:
+        try:
+            choice = int(input(f"Select a task number to edit/mark complete (or -1 to return to main menu): "))
+        except ValueError:
+            print("Please enter a valid integer.")
+            continue
+        if choice == -1 or 1 <= choice <= max_task_num:
             return choice
-        else:
-            print("Invalid task number.")
-            return get_valid_task_number(max_task_num)
-    except ValueError:
-        print("Please enter a valid integer.")
-        return get_valid_task_number(max_task_num)
+        print("Invalid task number.")
 
 # ===== View My Tasks Function =====
+def load_user_tasks(username):
+    # Indexed lookup of the user's tasks as (id, title, due, completed) rows
+    return get_tasks_db().execute(
+        "SELECT id, title, due, completed FROM tasks WHERE username = ? ORDER BY id", (username,)
+    ).fetchall()
+
 def view_mine(username, users):
     # Displays and allows editing of tasks assigned to the logged-in user
-    if not os.path.exists("tasks.txt"):
-        print("No tasks found.")
-        return
-
-    with open("tasks.txt", "r") as task_file:
-        tasks = [task.strip().split(", ") for task in task_file if len(task.strip().split(", ")) == 6]
-
-    user_tasks = [task for task in tasks if task[0] == username]
+    user_tasks = load_user_tasks(username)
 
     if not user_tasks:
         print("No tasks found for your user.")
@@ -160,100 +206,100 @@ def view_mine(username, users):
 
     while True:
         print("\nYour Tasks:")
-        for i, task in enumerate(user_tasks, 1):
-            print(f"{i}: Task: {task[1]}, Due: {task[4]}, Completed: {task[5]}")
+        for i, (task_id, title, due, completed) in enumerate(user_tasks, 1):
+            print(f"{i}: Task: {title}, Due: {from_iso(due)}, Completed: {'Yes' if completed else 'No'}")
 
         choice = get_valid_task_number(len(user_tasks))
         if choice == -1:
             break
 
-        selected_task = user_tasks[choice - 1]
-        print(f"\nSelected Task: {selected_task[1]} (Completed: {selected_task[5]})")
+        task_id, title, due, completed = user_tasks[choice - 1]
+        print(f"\nSelected Task: {title} (Completed: {'Yes' if completed else 'No'})")
 
-        if selected_task[5].lower() == "yes":
+        if completed:
             print("This task is already completed and cannot be edited.")
             continue
 
+        conn = get_tasks_db()
         action = input("Choose action - 'c' to mark complete, 'e' to edit, or 'b' to go back: ").lower()
         if action == 'c':
-            selected_task[5] = "Yes"
+            with conn:
+                conn.execute("UPDATE tasks SET completed = 1 WHERE id = ?", (task_id,))
+            user_tasks[choice - 1] = (task_id, title, due, 1)
             print("Task marked as complete.")
         elif action == 'e':
-            new_user = input(f"Enter new username to assign task (current: {selected_task[0]}), or press Enter to skip: ").strip()
+            reassigned = False
+            new_user = input(f"Enter new username to assign task (current: {username}), or press Enter to skip: ").strip()
             if new_user and new_user in users:
-                selected_task[0] = new_user
+                with conn:
+                    conn.execute("UPDATE tasks SET username = ? WHERE id = ?", (new_user, task_id))
+                reassigned = new_user != username
             elif new_user:
                 print("Username not found, skipping username change.")
             while True:
-                new_due_date = input(f"Enter new due date (DD Mon YYYY) (current: {selected_task[4]}), or press Enter to skip: ").strip()
+                new_due_date = input(f"Enter new due date (DD Mon YYYY) (current: {from_iso(due)}), or press Enter to skip: ").strip()
                 if not new_due_date:
                     break
                 try:
-                    datetime.strptime(new_due_date, "%d %b %Y")
-                    selected_task[4] = new_due_date
+                    new_due = to_iso(new_due_date)
+                    with conn:
+                        conn.execute("UPDATE tasks SET due = ? WHERE id = ?", (new_due, task_id))
+                    user_tasks[choice - 1] = (task_id, title, new_due, completed)
                     break
                 except ValueError:
                     print("Invalid date format. Try again.")
+            # A task handed to someone else leaves this user's list; other
+            # edits were applied to the cached row above
+            if reassigned:
+                del user_tasks[choice - 1]
         elif action == 'b':
             continue
         else:
             print("Invalid action. Returning to tasks list.")
             continue
 
-        # Update tasks list and write changes to file
-        task_index = tasks.index(user_tasks[choice - 1])
-        tasks[task_index] = selected_task
-
-        with open("tasks.txt", "w") as task_file:
-            for task in tasks:
-                task_file.write(", ".join(task) + "\n")
-
-        # Reload user tasks after update
-        user_tasks = [task for task in tasks if task[0] == username]
-
 # ===== View Completed Tasks Function =====
 def view_completed():
     # Displays all completed tasks
-    if not os.path.exists("tasks.txt"):
-        print("No tasks found.")
-        return
-    with open("tasks.txt", "r") as task_file:
-        tasks = task_file.readlines()
+    # Collect the output and write it to the terminal in one call
+    out = io.StringIO()
     found = False
-    for task in tasks:
-        task_parts = task.strip().split(", ")
-        if len(task_parts) == 6 and task_parts[5].lower() == "yes":
-            found = True
-            print(f"""
-Task: {task_parts[1]}
-Assigned to: {task_parts[0]}
-Date Assigned: {task_parts[3]}
-Due Date: {task_parts[4]}
+    for user, title, description, assigned, due in get_tasks_db().execute(
+        "SELECT username, title, description, assigned, due FROM tasks WHERE completed = 1 ORDER BY id"
+    ):
+        found = True
+        out.write(f"""
+Task: {title}
+Assigned to: {user}
+Date Assigned: {from_iso(assigned)}
+Due Date: {from_iso(due)}
 Description:
-{task_parts[2]}
+{description}
+
 """)
+    sys.stdout.write(out.getvalue())
     if not found:
         print("No completed tasks found.")
 
 # ===== Delete Task Function =====
 def delete_task():
     # Allows deletion of a task by number
-    if not os.path.exists("tasks.txt"):
-        print("No tasks found.")
-        return
-    with open("tasks.txt", "r") as task_file:
-        tasks = task_file.readlines()
-    if not tasks:
+    conn = get_tasks_db()
+    # Rows are printed as they stream from the cursor; only their ids are kept
+    task_ids = []
+    for task_id, user, title, description, assigned, due, completed in conn.execute(
+        "SELECT id, username, title, description, assigned, due, completed FROM tasks ORDER BY id"
+    ):
+        task_ids.append(task_id)
+        print(f"{len(task_ids)}: {user}, {title}, {description}, {from_iso(assigned)}, {from_iso(due)}, {'Yes' if completed else 'No'}")
+    if not task_ids:
         print("No tasks found.")
         return
-    for i, task in enumerate(tasks, 1):
-        print(f"{i}: {task.strip()}")
     try:
         task_number = int(input("Enter task number to delete: "))
-        if 1 <= task_number <= len(tasks):
-            tasks.pop(task_number - 1)
-            with open("tasks.txt", "w") as task_file:
-                task_file.writelines(tasks)
+        if 1 <= task_number <= len(task_ids):
+            with conn:
+                conn.execute("DELETE FROM tasks WHERE id = ?", (task_ids[task_number - 1],))
             print("Task deleted.")
         else:
             print("Invalid task number.")
@@ -263,62 +309,57 @@ def delete_task():
 # ===== Generate Reports Function =====
 def generate_reports(users):
     # Generates two reports: task_overview.txt and user_overview.txt
-    if not os.path.exists("tasks.txt"):
-        print("No tasks to generate reports from.")
-        return
-
-    with open("tasks.txt", "r") as task_file:
-        tasks = [task.strip().split(", ") for task in task_file if len(task.strip().split(", ")) == 6]
+    conn = get_tasks_db()
+    # A task is overdue once its due date has arrived and it is still open
+    today = date.today().isoformat()
+
+    # One grouped pass gives (total, completed, overdue) per user; the overall
+    # figures are the sums of those counters
+    counts = {
+        user: (total, completed, overdue)
+        for user, total, completed, overdue in conn.execute(
+            "SELECT username, COUNT(*), SUM(completed), SUM(completed = 0 AND due <= ?) FROM tasks GROUP BY username",
+            (today,),
+        )
+    }
 
     # Summary stats
-    total_tasks = len(tasks)
-    completed_tasks = sum(1 for t in tasks if t[5].lower() == "yes")
+    total_tasks = sum(c[0] for c in counts.values())
+    completed_tasks = sum(c[1] for c in counts.values())
+    overdue_tasks = sum(c[2] for c in counts.values())
     uncompleted_tasks = total_tasks - completed_tasks
-    overdue_tasks = sum(1 for t in tasks if t[5].lower() == "no" and datetime.strptime(t[4], "%d %b %Y") < datetime.today())
     pct_incomplete = (uncompleted_tasks / total_tasks * 100) if total_tasks else 0
     pct_overdue = (overdue_tasks / total_tasks * 100) if total_tasks else 0
 
-    # Write task overview
-    with open("task_overview.txt", "w") as task_report:
-        task_report.write(f"Total tasks: {total_tasks}\n")
-        task_report.write(f"Completed tasks: {completed_tasks}\n")
-        task_report.write(f"Uncompleted tasks: {uncompleted_tasks}\n")
-        task_report.write(f"Overdue tasks: {overdue_tasks}\n")
-        task_report.write(f"Percentage incomplete: {pct_incomplete:.2f}%\n")
-        task_report.write(f"Percentage overdue: {pct_overdue:.2f}%\n")
+    # Write task overview, assembled first so the file gets a single write
+    lines = [
+        f"Total tasks: {total_tasks}\n",
+        f"Completed tasks: {completed_tasks}\n",
+        f"Uncompleted tasks: {uncompleted_tasks}\n",
+        f"Overdue tasks: {overdue_tasks}\n",
+        f"Percentage incomplete: {pct_incomplete:.2f}%\n",
+        f"Percentage overdue: {pct_overdue:.2f}%\n",
+    ]
+    replace_file("task_overview.txt", "".join(lines))
 
     # Write user overview
-    total_users = len(users)
-    user_stats = {}
+    lines = [f"Total users: {len(users)}\n", f"Total tasks: {total_tasks}\n\n"]
     for user in users:
-        user_tasks = [t for t in tasks if t[0] == user]
-        total_user_tasks = len(user_tasks)
-        completed_user_tasks = sum(1 for t in user_tasks if t[5].lower() == "yes")
+        total_user_tasks, completed_user_tasks, overdue_user_tasks = counts.get(user, (0, 0, 0))
         uncompleted_user_tasks = total_user_tasks - completed_user_tasks
-        overdue_user_tasks = sum(1 for t in user_tasks if t[5].lower() == "no" and datetime.strptime(t[4], "%d %b %Y") < datetime.today())
         pct_tasks_assigned = (total_user_tasks / total_tasks * 100) if total_tasks else 0
         pct_completed = (completed_user_tasks / total_user_tasks * 100) if total_user_tasks else 0
         pct_uncompleted = (uncompleted_user_tasks / total_user_tasks * 100) if total_user_tasks else 0
         pct_overdue = (overdue_user_tasks / total_user_tasks * 100) if total_user_tasks else 0
 
-        user_stats[user] = {
-            "total_tasks": total_user_tasks,
-            "pct_tasks_assigned": pct_tasks_assigned,
-            "pct_completed": pct_completed,
-            "pct_uncompleted": pct_uncompleted,
-            "pct_overdue": pct_overdue,
-        }
-
-    with open("user_overview.txt", "w") as user_report:
-        user_report.write(f"Total users: {total_users}\n")
-        user_report.write(f"Total tasks: {total_tasks}\n\n")
-        for user, stats in user_stats.items():
-            user_report.write(f"User: {user}\n")
-            user_report.write(f"  Total tasks assigned: {stats['total_tasks']}\n")
-            user_report.write(f"  Percentage of total tasks assigned: {stats['pct_tasks_assigned']:.2f}%\n")
-            user_report.write(f"  Percentage completed: {stats['pct_completed']:.2f}%\n")
-            user_report.write(f"  Percentage uncompleted: {stats['pct_uncompleted']:.2f}%\n")
-            user_report.write(f"  Percentage overdue: {stats['pct_overdue']:.2f}%\n\n")
+        lines.append(f"User: {user}\n")
+        lines.append(f"  Total tasks assigned: {total_user_tasks}\n")
+        lines.append(f"  Percentage of total tasks assigned: {pct_tasks_assigned:.2f}%\n")
+        lines.append(f"  Percentage completed: {pct_completed:.2f}%\n")
+        lines.append(f"  Percentage uncompleted: {pct_uncompleted:.2f}%\n")
+        lines.append(f"  Percentage overdue: {pct_overdue:.2f}%\n\n")
+
+    replace_file("user_overview.txt", "".join(lines))
 
     print("Reports generated successfully.")
 
@@ -330,25 +371,27 @@ def display_statistics(users):
         generate_reports(users)
 
     print("\n--- Task Overview ---")
-    with open("task_overview.txt", "r") as task_report:
+    with open("task_overview.txt", "r", encoding="utf-8") as task_report:
         print(task_report.read())
 
     print("--- User Overview ---")
-    with open("user_overview.txt", "r") as user_report:
+    with open("user_overview.txt", "r", encoding="utf-8") as user_report:
         print(user_report.read())
 
 # ===== Main Function =====
 def main():
     # Main login and menu loop
+    init_tasks_db()
+    install_exit_handlers()
     while True:
         show_welcome_page()
         users = load_users()
 
         # Login loop
         while True:
-            username = input("Username: ").strip()
+            username = sys.intern(input("Username: ").strip())
             password = input("Password: ").strip()
-            if username in users and users[username] == password:
+            if username in users and check_password(users[username], password):
                 print(f"Welcome, {username}!")
                 break
             else:
@@ -391,6 +434,7 @@ e  - Exit
             elif choice == "ds" and username == "admin":
                 display_statistics(users)
             elif choice == "e":
+                close_writers()  # Sync and close this session's writers
                 print("Goodbye!\n")
                 break
             else:
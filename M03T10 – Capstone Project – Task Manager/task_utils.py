@@ -0,0 +1,255 @@
+"""
+Shared helpers for task_manager_pt1.py, task_manager_pt2.py and task_manager_pt3.py:
+the welcome banner, password hashing, loading user.txt, due date validation,
+the session append writers and their exit handlers, atomic file rewrites and the cached tasks.txt reader.
+"""
+from datetime import datetime
+from functools import lru_cache
+import csv
+import hashlib
+import hmac
+import locale
+import mmap
+import os
+import re
+import signal
+import sys
+
+# Menu escape words and yes/no answers, checked with O(1) set lookups
+QUIT_WORDS = frozenset({'q', 'e'})
+YES_NO = frozenset({'yes', 'no'})
+
+# Due dates look like "25 Oct 2024"; the format is checked with one compiled regex
+_DATE_RE = re.compile(r"^(0?[1-9]|[12]\d|3[01]) (Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec) [1-9]\d{3}$", re.IGNORECASE)
+
+# ===== Welcome Page Function =====
+def show_welcome_page():
+    # Print the welcome banner
+    print("""
+====================================
+      WELCOME TO TASK MANAGER
+====================================
+""")
+
+# ===== Password Hashing Functions =====
+def hash_password(password, salt=None):
+    # Returns the "salt, digest" record stored after the username in user.txt
+    if salt is None:
+        salt = os.urandom(16)
+    digest = hashlib.blake2b(password.encode("utf-8"), salt=salt, digest_size=32).hexdigest()
+    return f"{salt.hex()}, {digest}"
+
+def check_password(stored, password):
+    # Recomputes the salted digest and compares it in constant time
+    salt_hex, _, _ = stored.partition(", ")
+    try:
+        expected = hash_password(password, bytes.fromhex(salt_hex))
+    except ValueError:
+        return False  # Malformed record
+    return hmac.compare_digest(stored, expected)
+
+# ===== Load Users Function =====
+_users_cache = (None, None)  # (mtime/size key, parsed users)
+
+def load_users():
+    global _users_cache
+    users = {}  # Dictionary to store username:password pairs
+
+    ensure_utf8("user.txt")
+    # Check if user.txt exists
+    if os.path.exists("user.txt"):
+        # Reuse the last parse while user.txt is unchanged (same mtime and size)
+        st = os.stat("user.txt")
+        key = (st.st_mtime_ns, st.st_size)
+        if _users_cache[0] == key:
+            return _users_cache[1]
+        # Read the whole file with a single read() call
+        with open("user.txt", "rb") as user_file:
+            buf = user_file.read()
+        for line in buf.splitlines():
+            # Split each line into username and password
+            username, _, password = line.strip().partition(b", ")
+            if password:
+                # Interned so username comparisons elsewhere hit the identity fast path
+                users[sys.intern(username.decode("utf-8"))] = password.decode("utf-8")
+            # Lines without a ", " separator are malformed and skipped
+        # Hash any legacy plaintext passwords and rewrite the file once
+        legacy = [name for name, stored in users.items() if ", " not in stored]
+        if legacy:
+            for name in legacy:
+                users[name] = hash_password(users[name])
+            replace_file("user.txt", "".join(f"{name}, {stored}\n" for name, stored in users.items()))
+            st = os.stat("user.txt")
+            key = (st.st_mtime_ns, st.st_size)
+        _users_cache = (key, users)
+    else:
+        # If file doesn't exist, create one with default admin user
+        print("user.txt file is missing. Creating a default one with admin user.")
+        with open("user.txt", "w", encoding="utf-8") as user_file:
+            users["admin"] = hash_password("adm1n")
+            user_file.write(f"admin, {users['admin']}\n")
+    
+    return users  # Return the loaded users
+
+# ===== Today's Date Function =====
+@lru_cache(maxsize=1)
+def today_str(ordinal):
+    # Keyed on date.today().toordinal() so the string is only rebuilt when the day changes
+    return datetime.today().strftime("%d %b %Y")
+
+# ===== Due Date Validation Function =====
+def is_valid_due_date(due_date):
+    # The regex settles the format, so strptime is only needed for days 29-31
+    # where the month decides whether the date exists (e.g. 31 Feb)
+    match = _DATE_RE.match(due_date)
+    if not match:
+        return False
+    if int(match.group(1)) <= 28:
+        return True
+    try:
+        datetime.strptime(due_date, "%d %b %Y")
+        return True
+    except ValueError:
+        return False
+
+# ===== Task Line Formatting Function =====
+# Fields that csv.reader(..., skipinitialspace=True) would not read back as written
+_NEEDS_QUOTES = re.compile(r'[,"\r\n]|^\s')
+
+def format_task_line(fields):
+    # Joins the fields with ", " like the rest of tasks.txt, quoting any field that
+    # contains a comma or quote the way csv does, so titles and descriptions with
+    # commas survive the round trip through csv.reader
+    return ", ".join(
+        '"' + field.replace('"', '""') + '"' if _NEEDS_QUOTES.search(field) else field
+        for field in fields
+    ) + "\n"
+
+# ===== Task Line Parsing Functions =====
+def parse_task_line(line):
+    # Parses one task line with csv, so quoted fields from format_task_line keep
+    # their commas. Older files were written unquoted, so a line csv does not
+    # read as 6 fields (a bare comma as in "milk,eggs", or a stray unclosed
+    # quote) falls back to the original split(", ")
+    row = next(csv.reader((line,), skipinitialspace=True), [])
+    if len(row) != 6:
+        row = line.strip().split(", ")
+    return row
+
+def task_rows(lines):
+    # One row per line: each line goes through csv on its own, so a stray quote
+    # can never pull the following tasks into one multi-line row
+    return map(parse_task_line, lines)
+
+# ===== Atomic File Rewrite =====
+def replace_file(path, text):
+    # Writes the new contents to a temp file and renames it over path, so a
+    # crash mid-write leaves the old file intact instead of a truncated one
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as tmp_file:
+        tmp_file.write(text)
+    os.replace(tmp, path)
+
+# Every task and user file is read and written as UTF-8, whatever the locale's
+# default encoding, so the byte-level and text-level paths always agree.
+# Files saved by older versions in the locale's encoding are converted once.
+_utf8_checked = set()
+
+def ensure_utf8(path):
+    # Rewrites a legacy locale-encoded file as UTF-8 (once per path per session)
+    if path in _utf8_checked or not os.path.exists(path):
+        return
+    with open(path, "rb") as legacy_file:
+        buf = legacy_file.read()
+    try:
+        buf.decode("utf-8")
+    except UnicodeDecodeError:
+        text = buf.decode(locale.getpreferredencoding(False), errors="replace")
+        replace_file(path, text)
+    _utf8_checked.add(path)
+
+# ===== Buffered Writers =====
+_writers = {}  # path -> append handle kept open for the whole session
+
+def append_line(path, line):
+    # Appends through a handle kept open for the session and flushes each
+    # record straight away, so a crash or closed terminal cannot lose it
+    writer = _writers.get(path)
+    if writer is None:
+        writer = _writers[path] = open(path, "ab", buffering=131072)
+    writer.write(line.encode("utf-8"))
+    writer.flush()
+
+def flush_writers():
+    # Hands buffered records to the OS so the next read of the file sees them
+    for writer in _writers.values():
+        writer.flush()
+
+def close_writers():
+    # Flushes, syncs and closes every session writer (called on logout)
+    for writer in _writers.values():
+        writer.flush()
+        os.fsync(writer.fileno())
+        writer.close()
+    _writers.clear()
+
+def exit_on_signal(signum, frame):
+    # Closes the session writers before a SIGTERM or SIGHUP ends the program
+    close_writers()
+    sys.exit(128 + signum)
+
+def install_exit_handlers():
+    # SIGHUP does not exist on Windows, so only the signals present are hooked
+    for name in ("SIGTERM", "SIGHUP"):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), exit_on_signal)
+
+# ===== Cached Task Reader =====
+TASK_FH = None
+TASK_MTIME = None
+
+def tasks_reader():
+    # Keeps tasks.txt open with a 128 KiB buffer and rewinds it for each read,
+    # reopening only when the file has been modified since the last call
+    global TASK_FH, TASK_MTIME
+    flush_writers()
+    ensure_utf8("tasks.txt")
+    st = os.stat("tasks.txt")
+    mtime = (st.st_mtime_ns, st.st_size)
+    if TASK_FH is None or mtime != TASK_MTIME:
+        if TASK_FH is not None:
+            TASK_FH.close()
+        TASK_FH = open("tasks.txt", "r", encoding="utf-8", buffering=131072)
+        TASK_MTIME = mtime
+    else:
+        TASK_FH.seek(0)
+    return TASK_FH
+
+def close_tasks_reader():
+    # Closes the cached tasks.txt handle so the file can be replaced (Windows
+    # refuses to replace a file that is still open); the next read reopens it
+    global TASK_FH, TASK_MTIME
+    if TASK_FH is not None:
+        TASK_FH.close()
+    TASK_FH = None
+    TASK_MTIME = None
+
+# ===== Find Task Lines Function =====
+def find_task_lines(marker):
+    # Memory-map tasks.txt and jump between occurrences of marker with find(),
+    # so lines that cannot match are never decoded or split
+    fd = tasks_reader().fileno()  # Flushes pending appends first
+    if os.fstat(fd).st_size == 0:
+        return  # An empty file cannot be memory-mapped
+    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+        pos = mm.find(marker)
+        while pos != -1:
+            # Widen the hit to the whole line it sits on
+            start = mm.rfind(b"\n", 0, pos) + 1
+            end = mm.find(b"\n", pos)
+            if end == -1:
+                end = len(mm)
+            line = mm[start:end]
+            if line.startswith(marker):
+                yield line.decode("utf-8").strip()
+            pos = mm.find(marker, end)
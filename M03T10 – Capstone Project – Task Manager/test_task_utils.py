@@ -0,0 +1,33 @@
+"""
+Regression tests for the tasks.txt line parsing in task_utils.py.
+Run from this folder with: python -m unittest test_task_utils
+"""
+import unittest
+
+from task_utils import format_task_line, task_rows
+
+
+class TaskRowsTest(unittest.TestCase):
+    def test_unclosed_quote_does_not_swallow_later_tasks(self):
+        lines = [
+            'tk26, "Draft report, write it, 01 Jan 2025, 02 Jan 2025, No\n',
+            "tk26, Second, Check it, 01 Jan 2025, 03 Jan 2025, No\n",
+            "admin, Third, Ship it, 01 Jan 2025, 04 Jan 2025, Yes\n",
+        ]
+        rows = list(task_rows(lines))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0], ["tk26", '"Draft report', "write it", "01 Jan 2025", "02 Jan 2025", "No"])
+        self.assertEqual(rows[1][1], "Second")
+        self.assertEqual(rows[2][1], "Third")
+
+    def test_legacy_bare_comma_uses_old_split(self):
+        rows = list(task_rows(["tk26, Shopping, milk,eggs, 07 Jun 2025, 10 Jun 2025, No\n"]))
+        self.assertEqual(rows, [["tk26", "Shopping", "milk,eggs", "07 Jun 2025", "10 Jun 2025", "No"]])
+
+    def test_quoted_fields_round_trip(self):
+        fields = ["tk26", 'Say "hi", then go', "a, b", "07 Jun 2025", "10 Jun 2025", "No"]
+        self.assertEqual(list(task_rows([format_task_line(fields)])), [fields])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,13 +5,14 @@ A small-bookstore inventory manager rewritten for clarity, safety and maintainab
 
 Features:
 ---------
-* Creates/opens an SQLite database called "ebookstore.db".
+* Loads the SQLite database "ebookstore.db" into memory and saves it back
+  periodically and on exit.
 * Creates author and book tables and seeds them with starter data.
 * Presents an interactive menu so a clerk can:
   1. Add a new book
   2. Update an existing book or its author's details
   3. Delete a book
-  4. Search for books by ID or title keyword
+  4. Search for books by ID, title keyword or title prefix
   5. View all book details
   0. Exit the program
 
@@ -43,16 +44,23 @@ Pseudocode Overview:
 
 from __future__ import annotations
 
-import re
+import atexit
+import signal
 import sqlite3
+import sys
+import time
 from contextlib import closing
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 
 # Constants & starter data
 
 DB_FILE = Path("ebookstore.db")
+SAVE_INTERVAL = 5.0  # Minimum seconds between snapshots of the in-memory DB to DB_FILE
+LIST_BATCH = 1000  # Rows fetched and written per batch when listing every book
+SEARCH_CACHE_TTL = 60.0  # Seconds a cached title-search result stays valid
+SEARCH_CACHE_SIZE = 200  # Most title searches kept in the cache at once
 
 STARTER_BOOKS: Tuple[Tuple[int, str, int, int], ...] = (
     (3001, "A Tale of Two Cities", 1290, 30),
@@ -70,16 +78,74 @@ STARTER_AUTHORS: Tuple[Tuple[int, str, str], ...] = (
     (5620, "Lewis Carroll", "England"),
 )
 
-ID_PATTERN = re.compile(r"^[0-9]{4}$")
-
 # Database helpers
 
 
 def connect_db() -> sqlite3.Connection:
-    return sqlite3.connect(DB_FILE, timeout=10, isolation_level="DEFERRED")
+    conn = sqlite3.connect(DB_FILE, timeout=10, isolation_level="DEFERRED")
+    # Per-connection tuning: with WAL, NORMAL sync is still crash-safe, and an
+    # 8 MB page cache keeps this small database memory-resident
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-8000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+_CONN: Optional[sqlite3.Connection] = None
+_last_save = 0.0
+_dirty = False  # True while the in-memory DB has writes not yet saved to DB_FILE
+
+# The session works on an in-memory copy of the database, so edits never wait
+# on disk syncs. It is loaded from DB_FILE on first use and copied back with
+# the SQLite backup API by save_db()
+def get_conn() -> sqlite3.Connection:
+    global _CONN
+    if _CONN is None:
+        _CONN = sqlite3.connect(":memory:", isolation_level="DEFERRED")
+        with closing(connect_db()) as disk:
+            # WAL is stored in the database file, so it only needs setting once
+            disk.execute("PRAGMA journal_mode=WAL")
+            disk.backup(_CONN)
+        atexit.register(close_conn)  # Final save even if the menu is not exited cleanly
+    return _CONN
+
+def save_db() -> None:
+    global _last_save, _dirty
+    with closing(connect_db()) as disk:
+        _CONN.backup(disk)
+    _last_save = time.monotonic()
+    _dirty = False
+
+def save_db_if_due() -> None:
+    # Called after every write; snapshots at most once per SAVE_INTERVAL and
+    # otherwise marks the write as pending for save_db_if_dirty()
+    global _dirty
+    if time.monotonic() - _last_save >= SAVE_INTERVAL:
+        save_db()
+    else:
+        _dirty = True
+
+def save_db_if_dirty() -> None:
+    # Called each time the menu is shown, so a write skipped by the interval is
+    # on disk before the program waits for input again
+    if _dirty:
+        save_db()
+
+def exit_on_signal(signum, frame) -> None:
+    # SIGTERM/SIGHUP (e.g. the terminal closing) skip atexit handlers unless
+    # turned into SystemExit, which lets close_conn() save the database
+    raise SystemExit(128 + signum)
+
+def close_conn() -> None:
+    global _CONN
+    if _CONN is not None:
+        save_db()
+        _CONN.close()
+        _CONN = None
 
 def initialise_schema() -> None:
-    with connect_db() as conn, conn:
+    conn = get_conn()
+    # Tables and both seed inserts share one transaction and one commit
+    with conn:
         cur = conn.cursor()
         cur.execute("""
             CREATE TABLE IF NOT EXISTS author (
@@ -97,16 +163,66 @@ def initialise_schema() -> None:
                 FOREIGN KEY (authorID) REFERENCES author(id)
             )
         """)
+        # Every details/search query joins book.authorID to author.id
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_book_author ON book(authorID)")
+        # Covers list_all_details: rows come out already ordered by title and
+        # carry authorID and qty, so there is no sort step and no table lookup
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_book_title ON book(title, authorID, qty)")
+        # LIKE is case-insensitive, so only a NOCASE index can serve prefix searches
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_book_title_nocase ON book(title COLLATE NOCASE)")
+        fts_is_new = create_title_index(cur)
         if not cur.execute("SELECT 1 FROM author LIMIT 1").fetchone():
             cur.executemany("INSERT INTO author (id, name, country) VALUES (?, ?, ?)", STARTER_AUTHORS)
         if not cur.execute("SELECT 1 FROM book LIMIT 1").fetchone():
             cur.executemany("INSERT INTO book (id, title, authorID, qty) VALUES (?, ?, ?, ?)", STARTER_BOOKS)
+        if fts_is_new:
+            # Index the titles of books that existed before the FTS table
+            cur.execute("INSERT INTO book_fts(book_fts) VALUES ('rebuild')")
+
+def create_title_index(cur: sqlite3.Cursor) -> bool:
+    # Full-text index over book.title for keyword search. It stores no text of its
+    # own (content='book') and is kept in sync by triggers. Returns True when the
+    # table was just created and still needs filling
+    exists = cur.execute("SELECT 1 FROM sqlite_master WHERE name = 'book_fts'").fetchone()
+    cur.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS book_fts
+        USING fts5(title, content='book', content_rowid='id')
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS book_fts_insert AFTER INSERT ON book BEGIN
+            INSERT INTO book_fts(rowid, title) VALUES (new.id, new.title);
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS book_fts_delete AFTER DELETE ON book BEGIN
+            INSERT INTO book_fts(book_fts, rowid, title) VALUES ('delete', old.id, old.title);
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS book_fts_update AFTER UPDATE ON book BEGIN
+            INSERT INTO book_fts(book_fts, rowid, title) VALUES ('delete', old.id, old.title);
+            INSERT INTO book_fts(rowid, title) VALUES (new.id, new.title);
+        END
+    """)
+    return exists is None
+
+def title_match_query(keyword: str) -> str:
+    # Turns "lord ring" into '"lord"* "ring"*': every word must start a word in
+    # the title. Quoting keeps FTS5 operators in user input from being parsed
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in keyword.split())
+
+def title_prefix_pattern(prefix: str) -> str:
+    # LIKE pattern for titles starting with prefix, with its own % and _ escaped.
+    # The pattern is bound whole: building it in SQL (? || '%') would stop SQLite
+    # turning the LIKE into an index range scan
+    return prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
 
 
 # Input validation helpers
 
 def validate_four_digit(value: str) -> int:
-    if not ID_PATTERN.fullmatch(value):
+    # Exactly four ASCII digits; isascii() keeps out other Unicode digits isdigit() accepts
+    if len(value) != 4 or not (value.isascii() and value.isdigit()):
         raise ValueError("ID must be exactly four numeric digits (e.g. 1234).")
     return int(value)
 
@@ -140,25 +256,33 @@ def prompt_non_blank(label: str) -> str:
 
 # Reusable DB helpers
 
+# Fixed SQL per table, so each lookup reuses the statement sqlite3 already
+# prepared and cached for the connection instead of formatting a new string
+EXISTS_SQL = {
+    "book": "SELECT 1 FROM book WHERE id = ?",
+    "author": "SELECT 1 FROM author WHERE id = ?",
+}
+
 def record_exists(table: str, pk: int) -> bool:
-    with connect_db() as conn, closing(conn.cursor()) as cur:
-        cur.execute(f"SELECT 1 FROM {table} WHERE id = ?", (pk,))
+    with closing(get_conn().cursor()) as cur:
+        cur.execute(EXISTS_SQL[table], (pk,))
         return cur.fetchone() is not None
 
-def execute(sql: str, params: tuple = ()) -> None:
-    with connect_db() as conn, conn:
-        conn.execute(sql, params)
+def execute(sql: str, params: tuple = ()) -> int:
+    conn = get_conn()
+    with conn:  # Commit on success, roll back on error
+        rowcount = conn.execute(sql, params).rowcount
+    if rowcount:
+        _search_cache.clear()  # Any change to book or author can alter search results
+    save_db_if_due()
+    return rowcount
 
 
 # Feature: Add book
 
 def add_book() -> None:
     print("\n Add New Book")
-    while True:
-        book_id = prompt_id("Book ID")
-        if not record_exists("book", book_id):
-            break
-        print("That book ID already exists - choose a different one.")
+    book_id = prompt_id("Book ID")
     title = prompt_non_blank("Title")
     qty = prompt_positive_int("Quantity in stock")
     author_id = prompt_id("Author ID")
@@ -166,18 +290,25 @@ def add_book() -> None:
         print("Author ID not found - let's create that author.")
         author_name = prompt_non_blank("Author name")
         author_country = prompt_non_blank("  Author country")
-        execute("INSERT INTO author (id, name, country) VALUES (?, ?, ?)", (author_id, author_name, author_country))
-    try:
-        execute("INSERT INTO book (id, title, authorID, qty) VALUES (?, ?, ?, ?)", (book_id, title, author_id, qty))
-        print("Book added.")
-    except sqlite3.IntegrityError as exc:
-        print(f"DB error: {exc}")
+        # OR IGNORE: if the author appeared since the check, keep that row
+        if execute("INSERT OR IGNORE INTO author (id, name, country) VALUES (?, ?, ?)",
+                   (author_id, author_name, author_country)):
+            print("Author added.")
+    # The primary key rejects duplicates, so no separate existence check is needed
+    while True:
+        try:
+            execute("INSERT INTO book (id, title, authorID, qty) VALUES (?, ?, ?, ?)", (book_id, title, author_id, qty))
+            print("Book added.")
+            return
+        except sqlite3.IntegrityError:
+            print("That book ID already exists - choose a different one.")
+            book_id = prompt_id("Book ID")
 
 
 # Feature: Update book
 
 def fetch_book_details(book_id: int):
-    with connect_db() as conn, closing(conn.cursor()) as cur:
+    with closing(get_conn().cursor()) as cur:
         cur.execute("""
             SELECT b.title, b.qty, a.id, a.name, a.country
             FROM book b JOIN author a ON b.authorID = a.id
@@ -191,10 +322,11 @@ def update_book() -> None:
         book_id = prompt_id("Book ID", allow_back=True)
         if book_id is None:
             return
-        if record_exists("book", book_id):
+        details = fetch_book_details(book_id)
+        if details:
             break
         print("No book matches that ID - try again.")
-    title, qty, auth_id, auth_name, auth_country = fetch_book_details(book_id)
+    title, qty, auth_id, auth_name, auth_country = details
     print("\nCurrent details")
     print("---------------")
     print(f"Title          : {title}")
@@ -235,47 +367,91 @@ def delete_book() -> None:
         book_id = prompt_id("Book ID", allow_back=True)
         if book_id is None:
             return
-        if record_exists("book", book_id):
-            break
-        print("That ID does not exist - try again.")
-    if input("Are you sure? [y/N]: ").lower() != "y":
-        print("Deletion cancelled.")
+        # Confirm only once the ID is known to exist
+        if not record_exists("book", book_id):
+            print("That ID does not exist - try again.")
+            continue
+        if input("Are you sure? [y/N]: ").lower() != "y":
+            print("Deletion cancelled.")
+            return
+        execute("DELETE FROM book WHERE id = ?", (book_id,))
+        print("Book deleted.")
         return
-    execute("DELETE FROM book WHERE id = ?", (book_id,))
-    print("Book deleted.")
 
 
 # Feature: Search & view
 
 def list_all_details() -> None:
     print("\n Every Book\n")
-    with connect_db() as conn, closing(conn.cursor()) as cur:
+    with closing(get_conn().cursor()) as cur:
         cur.execute("""
             SELECT b.title, a.name, a.country, b.qty
             FROM book b JOIN author a ON b.authorID = a.id
             ORDER BY b.title
         """)
-        rows = cur.fetchall()
-    if not rows:
+        # Stream the result in batches, one write per batch, so the whole
+        # catalogue is never held in memory at once
+        any_rows = False
+        while rows := cur.fetchmany(LIST_BATCH):
+            any_rows = True
+            sys.stdout.write("".join(
+                f"{'-' * 50}\n"
+                f"Title           : {title}\n"
+                f"Author          : {name}\n"
+                f"Country         : {country}\n"
+                f"In stock        : {qty}\n"
+                for title, name, country, qty in rows
+            ))
+    if not any_rows:
         print("No books yet.")
         return
-    for title, name, country, qty in rows:
-        print("-" * 50)
-        print(f"Title           : {title}")
-        print(f"Author          : {name}")
-        print(f"Country         : {country}")
-        print(f"In stock        : {qty}")
     print("-" * 50)
 
+# Recent title searches: (mode, lowered text) -> (time stored, rows). Clerks often
+# repeat or refine a search, and a hit skips the query entirely. Every write
+# through execute() clears it
+_search_cache: Dict[Tuple[str, str], Tuple[float, List[tuple]]] = {}
+
+def search_titles(mode: str, text: str) -> List[tuple]:
+    # (title, author name, country) rows for a keyword ("2") or prefix ("3") search
+    key = (mode, text.lower())
+    now = time.monotonic()
+    cached = _search_cache.get(key)
+    if cached and now - cached[0] < SEARCH_CACHE_TTL:
+        return cached[1]
+    with closing(get_conn().cursor()) as cur:
+        if mode == "2":
+            cur.execute("""
+                SELECT b.title, a.name, a.country
+                FROM book_fts f
+                JOIN book b ON b.id = f.rowid
+                JOIN author a ON b.authorID = a.id
+                WHERE book_fts MATCH ?
+                ORDER BY f.rank
+            """, (title_match_query(text),))
+        else:
+            cur.execute("""
+                SELECT b.title, a.name, a.country
+                FROM book b JOIN author a ON b.authorID = a.id
+                WHERE b.title LIKE ? ESCAPE '\\'
+                ORDER BY b.title COLLATE NOCASE
+            """, (title_prefix_pattern(text),))
+        rows = cur.fetchall()
+    _search_cache.pop(key, None)
+    if len(_search_cache) >= SEARCH_CACHE_SIZE:
+        del _search_cache[next(iter(_search_cache))]  # Dicts keep insertion order: drop the oldest
+    _search_cache[key] = (now, rows)
+    return rows
+
 def search_books() -> None:
     print("\n Search Books")
-    mode = input("1. By ID  2. By title keyword  (default 1): ").strip() or "1"
+    mode = input("1. By ID  2. By title keyword  3. By title start  (default 1): ").strip() or "1"
     if mode == "1":
         while True:
             bid = prompt_id("Book ID", allow_back=True)
             if bid is None:
                 return
-            with connect_db() as conn, closing(conn.cursor()) as cur:
+            with closing(get_conn().cursor()) as cur:
                 cur.execute("""
                     SELECT b.title, a.name, a.country, b.qty
                     FROM book b JOIN author a ON b.authorID = a.id
@@ -291,15 +467,13 @@ def search_books() -> None:
                 print(f"In stock: {qty}")
                 return
             print("No match try again.")
-    elif mode == "2":
-        kw = prompt_non_blank("Keyword in title")
-        with connect_db() as conn, closing(conn.cursor()) as cur:
-            cur.execute("""
-                SELECT b.title, a.name, a.country
-                FROM book b JOIN author a ON b.authorID = a.id
-                WHERE b.title LIKE ?
-            """, (f"%{kw}%",))
-            rows = cur.fetchall()
+    elif mode in ("2", "3"):
+        text = prompt_non_blank("Keyword in title" if mode == "2" else "Title starts with")
+        if mode == "2" and not any(ch.isalnum() for ch in text):
+            # Punctuation alone holds no words for the title index to match
+            print("No matches.")
+            return
+        rows = search_titles(mode, text)
         if rows:
             for title, name, country in rows:
                 print(f"* {title}  —  {name} ({country})")
@@ -312,6 +486,9 @@ def search_books() -> None:
 # Main Menu
 
 def main_menu() -> None:
+    for name in ("SIGTERM", "SIGHUP"):  # SIGHUP does not exist on Windows
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), exit_on_signal)
     initialise_schema()
     actions = {
         "1": add_book,
@@ -321,6 +498,7 @@ def main_menu() -> None:
         "5": list_all_details,
     }
     while True:
+        save_db_if_dirty()
         print("""
     Inventory Menu
   1. Enter book
@@ -332,6 +510,7 @@ def main_menu() -> None:
 """)
         choice = input("Select option: ").strip()
         if choice == "0":
+            close_conn()
             print("Goodbye!")
             break
         action = actions.get(choice)
@@ -41,7 +41,13 @@ STARTER_BOOKS: Tuple[Tuple[int, str, int, int], ...] = (
 # Database setup
 def get_connection() -> sqlite3.Connection:
     """Connect to the SQLite database (or create if it doesn't exist)."""
-    return sqlite3.connect(DB_FILE)
+    conn = sqlite3.connect(DB_FILE)
+    # WAL lets commits append to a log instead of rewriting pages, and with WAL
+    # synchronous=NORMAL only syncs at checkpoints while staying crash-safe
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
 
 
 def initialise_schema(cur: sqlite3.Cursor) -> None:
@@ -57,6 +63,7 @@ def initialise_schema(cur: sqlite3.Cursor) -> None:
             qty      INTEGER NOT NULL CHECK (qty >= 0)
         )
     """)
+    fts_is_new = create_title_index(cur)
     # intiate  with starter books if the table is empty
     cur.execute("SELECT COUNT(*) FROM book")
     if cur.fetchone()[0] == 0:
@@ -64,6 +71,57 @@ def initialise_schema(cur: sqlite3.Cursor) -> None:
             "INSERT INTO book (id, title, authorID, qty) VALUES (?, ?, ?, ?)",
             STARTER_BOOKS,
         )
+    if fts_is_new:
+        # Index the titles of books that existed before the FTS table
+        cur.execute("INSERT INTO book_fts(book_fts) VALUES ('rebuild')")
+
+
+def create_title_index(cur: sqlite3.Cursor) -> bool:
+    """
+    Create the FTS5 full-text index over book.title used by keyword search.
+    The index stores no text of its own (content='book') and is kept in sync
+    by triggers. Returns True when the table was just created and still
+    needs filling.
+    """
+    cur.execute("SELECT 1 FROM sqlite_master WHERE name = 'book_fts'")
+    exists = cur.fetchone()
+    cur.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS book_fts
+        USING fts5(title, content='book', content_rowid='id')
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS book_fts_insert AFTER INSERT ON book BEGIN
+            INSERT INTO book_fts(rowid, title) VALUES (new.id, new.title);
+        END
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS book_fts_delete AFTER DELETE ON book BEGIN
+            INSERT INTO book_fts(book_fts, rowid, title) VALUES ('delete', old.id, old.title);
+        END
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS book_fts_update AFTER UPDATE ON book BEGIN
+            INSERT INTO book_fts(book_fts, rowid, title) VALUES ('delete', old.id, old.title);
+            INSERT INTO book_fts(rowid, title) VALUES (new.id, new.title);
+        END
+        """
+    )
+    return exists is None
+
+
+def title_match_query(keyword: str) -> str:
+    """
+    Turn "lord ring" into '"lord"* "ring"*' so every word must start a word
+    in the title. Quoting keeps FTS5 operators in user input from being parsed.
+    """
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in keyword.split())
 
 
 # Input helpers
@@ -85,10 +143,11 @@ def prompt_int(
         if not value:
             print("Input cannot be blank. Try again.")
             continue
-        if not value.isdigit():
+        try:
+            num = int(value)
+        except ValueError:
             print("Please enter a valid number.")
             continue
-        num = int(value)
         if positive and num <= 0:
             print("Number must be greater than zero.")
             continue
@@ -238,7 +297,19 @@ def search_books(cur: sqlite3.Cursor) -> None:
         if not keyword:
             print("Keyword cannot be empty.")
             return
-        cur.execute("SELECT * FROM book WHERE title LIKE ?", (f"%{keyword}%",))
+        if not any(ch.isalnum() for ch in keyword):
+            # Punctuation alone holds no words for the title index to match
+            print("No matching books found.")
+            return
+        cur.execute(
+            """
+            SELECT b.* FROM book_fts f
+            JOIN book b ON b.id = f.rowid
+            WHERE book_fts MATCH ?
+            ORDER BY f.rank
+            """,
+            (title_match_query(keyword),),
+        )
         rows = cur.fetchall()
         if rows:
             print("\n Search Results:")
@@ -284,7 +355,9 @@ def menu() -> None:
             else:
                 print("Invalid selection, please try again.")
 
-            conn.commit()
+            # Only writes open a transaction, so read-only actions skip the commit
+            if conn.in_transaction:
+                conn.commit()
 
 
 # Entry point
@@ -48,7 +48,13 @@ STARTER_AUTHORS: Tuple[Tuple[int, str, str], ...] = (
 
 def get_connection() -> sqlite3.Connection:
     """Connect to (or create) the SQLite DB."""
-    return sqlite3.connect(DB_FILE)
+    conn = sqlite3.connect(DB_FILE)
+    # WAL lets commits append to a log instead of rewriting pages, and with WAL
+    # synchronous=NORMAL only syncs at checkpoints while staying crash-safe
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
 
 
 def initialise_schema(cur: sqlite3.Cursor) -> None:
@@ -77,6 +83,14 @@ def initialise_schema(cur: sqlite3.Cursor) -> None:
         """
     )
 
+    # Same definitions as shelf_track v3, which shares ebookstore.db.
+    # authorID serves lookups of an author's books; (title, authorID, qty)
+    # covers view_all_details, so it reads in title order without a sort
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_book_author ON book(authorID)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_book_title ON book(title, authorID, qty)")
+
+    fts_is_new = create_title_index(cur)
+
     # predifined authors
     cur.execute("SELECT COUNT(*) FROM author")
     if cur.fetchone()[0] == 0:
@@ -93,6 +107,58 @@ def initialise_schema(cur: sqlite3.Cursor) -> None:
             STARTER_BOOKS,
         )
 
+    if fts_is_new:
+        # Index the titles of books that existed before the FTS table
+        cur.execute("INSERT INTO book_fts(book_fts) VALUES ('rebuild')")
+
+
+def create_title_index(cur: sqlite3.Cursor) -> bool:
+    """
+    Create the FTS5 full-text index over book.title used by keyword search.
+    The index stores no text of its own (content='book') and is kept in sync
+    by triggers. Returns True when the table was just created and still
+    needs filling.
+    """
+    cur.execute("SELECT 1 FROM sqlite_master WHERE name = 'book_fts'")
+    exists = cur.fetchone()
+    cur.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS book_fts
+        USING fts5(title, content='book', content_rowid='id')
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS book_fts_insert AFTER INSERT ON book BEGIN
+            INSERT INTO book_fts(rowid, title) VALUES (new.id, new.title);
+        END
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS book_fts_delete AFTER DELETE ON book BEGIN
+            INSERT INTO book_fts(book_fts, rowid, title) VALUES ('delete', old.id, old.title);
+        END
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS book_fts_update AFTER UPDATE ON book BEGIN
+            INSERT INTO book_fts(book_fts, rowid, title) VALUES ('delete', old.id, old.title);
+            INSERT INTO book_fts(rowid, title) VALUES (new.id, new.title);
+        END
+        """
+    )
+    return exists is None
+
+
+def title_match_query(keyword: str) -> str:
+    """
+    Turn "lord ring" into '"lord"* "ring"*' so every word must start a word
+    in the title. Quoting keeps FTS5 operators in user input from being parsed.
+    """
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in keyword.split())
+
 
 # Input helpers
 
@@ -114,19 +180,28 @@ def prompt_int(
         if not value:
             print("Input cannot be blank. Try again.")
             continue
-        if not value.isdigit():
+        try:
+            num = int(value)
+        except ValueError:
             print("Please enter a valid number.")
             continue
-        num = int(value)
         if positive and num <= 0:
             print("Number must be greater than zero.")
             continue
         return num
 
 
+# Fixed SQL per table, so each lookup reuses the statement sqlite3 already
+# prepared and cached for the connection instead of formatting a new string
+EXISTS_SQL = {
+    "book": "SELECT 1 FROM book WHERE id = ?",
+    "author": "SELECT 1 FROM author WHERE id = ?",
+}
+
+
 def record_exists(cur: sqlite3.Cursor, table: str, pk: int) -> bool:
     """Generic existence check for a primary-key value in `table`."""
-    cur.execute(f"SELECT 1 FROM {table} WHERE id = ?", (pk,))
+    cur.execute(EXISTS_SQL[table], (pk,))
     return cur.fetchone() is not None
 
 
@@ -137,13 +212,8 @@ def add_book(cur: sqlite3.Cursor) -> None:
     """Add a new book (and author row if needed)."""
     print("\n  Add New Book")
 
-    # Book ID (unique)
-    while True:
-        new_id = prompt_int("Enter new book ID: ", positive=True)
-        if record_exists(cur, "book", new_id):
-            print("That ID already exists. Please choose another.")
-        else:
-            break
+    # Book ID (uniqueness is enforced by the primary key on insert)
+    new_id = prompt_int("Enter new book ID: ", positive=True)
 
     # Title
     title = input("Enter book title: ").strip()
@@ -162,26 +232,35 @@ def add_book(cur: sqlite3.Cursor) -> None:
             print("Author data incomplete. Operation cancelled.")
             return
         try:
+            # OR IGNORE: if the author appeared since the check, keep that row
             cur.execute(
-                "INSERT INTO author (id, name, country) VALUES (?, ?, ?)",
+                "INSERT OR IGNORE INTO author (id, name, country) VALUES (?, ?, ?)",
                 (author_id, name, country),
             )
         except sqlite3.Error as exc:
             print(f"Database error: {exc}")
             return
+        if cur.rowcount:
+            print("Author added.")
 
     # Quantity
     qty = prompt_int("Enter quantity: ", positive=True)
 
-    # Insert book
-    try:
-        cur.execute(
-            "INSERT INTO book (id, title, authorID, qty) VALUES (?, ?, ?, ?)",
-            (new_id, title, author_id, qty),
-        )
-        print("Book added successfully.")
-    except sqlite3.Error as exc:
-        print(f"Database error: {exc}")
+    # Insert book; a duplicate ID raises IntegrityError, so ask for another
+    while True:
+        try:
+            cur.execute(
+                "INSERT INTO book (id, title, authorID, qty) VALUES (?, ?, ?, ?)",
+                (new_id, title, author_id, qty),
+            )
+            print("Book added successfully.")
+            return
+        except sqlite3.IntegrityError:
+            print("That ID already exists. Please choose another.")
+            new_id = prompt_int("Enter new book ID: ", positive=True)
+        except sqlite3.Error as exc:
+            print(f"Database error: {exc}")
+            return
 
 
 def update_book(cur: sqlite3.Cursor) -> None:
@@ -333,14 +412,20 @@ def search_books(cur: sqlite3.Cursor) -> None:
         if not keyword:
             print("Keyword cannot be empty.")
             return
+        if not any(ch.isalnum() for ch in keyword):
+            # Punctuation alone holds no words for the title index to match
+            print("No matching books found.")
+            return
         cur.execute(
             """
             SELECT b.title, a.name, a.country
-            FROM book b
+            FROM book_fts f
+            JOIN book b ON b.id = f.rowid
             JOIN author a ON b.authorID = a.id
-            WHERE b.title LIKE ?
+            WHERE book_fts MATCH ?
+            ORDER BY f.rank
             """,
-            (f"%{keyword}%",),
+            (title_match_query(keyword),),
         )
         rows = cur.fetchall()
         if rows:
@@ -415,7 +500,9 @@ def menu() -> None:
             else:
                 print("Invalid selection, please try again.")
 
-            conn.commit()
+            # Only writes open a transaction, so read-only actions skip the commit
+            if conn.in_transaction:
+                conn.commit()
 
 
 # Entry point
@@ -21,13 +21,15 @@ How to run (Terminal)
 1) activate a virtual environment (recommended).
 2) Install requirements and language model:
        pip install spacy spacytextblob pandas
-       python -m spacy download en_core_web_md
+       python -m spacy download en_core_web_sm
+       python -m spacy download en_core_web_md   (optional, for the similarity demo)
        python -m textblob.download_corpora
 3) Run:
        python sentiment_analysis.py
+   (set SENTIMENT_PROCESSES=N to run the spaCy pipeline in N worker processes)
 Outputs
 
-  • outputs/sentiment_scored.csv 
+  • outputs/sentiment_scored.parquet (or .csv without pyarrow / with SENTIMENT_OUTPUT=csv)
   • outputs/example_snippets.txt 
   • outputs/similarity_demo.txt
   • Console printout
@@ -38,6 +40,7 @@ from __future__ import annotations
 import os, sys
 from pathlib import Path
 from typing import Tuple, List
+import numpy as np
 import pandas as pd
 
 # Column name that contains free-text reviews.
@@ -46,24 +49,29 @@ COL_REVIEW = "reviews.text"
 # environment variable for explicitly setting the CSV path.
 ENV_DATA_PATH = os.environ.get("AMAZON_REVIEWS_CSV", "")
 
+# Output format for the scored table: "parquet" (default, needs pyarrow) or "csv".
+ENV_OUTPUT_FORMAT = os.environ.get("SENTIMENT_OUTPUT", "parquet").lower()
+
 # If no environment variable is provided, I look for these filenames next to the script.
 DEFAULT_CSV_CANDIDATES = [
     "Datafiniti_Amazon_Consumer_Reviews_of_Amazon_Products_May19.csv",
     "amazon_reviews.csv",
 ]
 
+# nlp.pipe settings: reviews are streamed through the pipeline in batches. TextBlob
+# sentiment, the expensive part, is computed afterwards in this process, so extra
+# worker processes only parallelise the cheap tokenizer/tagger/lemmatizer work while
+# paying to start each worker and ship every Doc back. One process is the default;
+# set SENTIMENT_PROCESSES to opt in to more. Parser and NER output is never used,
+# so they are off.
+PIPE_BATCH_SIZE = 256
+PIPE_PROCESSES = max(1, int(os.environ.get("SENTIMENT_PROCESSES", "1")))
+UNUSED_PIPES = ("parser", "ner")
 
-def load_nlp():
-    """
-    Load spaCy + the 'en_core_web_md' model and add spaCyTextBlob to the pipeline.
-
-    Returns:
-        nlp: a configured spaCy Language object with spacytextblob enabled.
 
-    Defensive notes:
-        - If spaCy or spacytextblob are missing, I print clear install instructions.
-        - 'en_core_web_md' is required here for better embeddings than the small model.
-        - TextBlob corpora are fetched for sentiment subjectivity/polarity.
+def import_spacy():
+    """
+    Import spaCy, printing clear install instructions if it is missing.
     """
     try:
         import spacy
@@ -72,16 +80,34 @@ def load_nlp():
         sys.stderr.write(
             "\n[error] Install spaCy & model:\n"
             "    pip install spacy spacytextblob pandas\n"
-            "    python -m spacy download en_core_web_md\n"
+            "    python -m spacy download en_core_web_sm\n"
             "    python -m textblob.download_corpora\n\n"
         )
         raise
+    return spacy
+
+
+def load_scorer():
+    """
+    Load spaCy + the small 'en_core_web_sm' model and add spaCyTextBlob to the pipeline.
+
+    Returns:
+        nlp: a configured spaCy Language object with spacytextblob enabled.
+
+    Defensive notes:
+        - If spaCy or spacytextblob are missing, I print clear install instructions.
+        - Scoring only needs tokens, lemmas and stop words (TextBlob polarity works
+          on the raw text), so the small model is enough and the parser and NER
+          are never loaded.
+        - TextBlob corpora are fetched for sentiment subjectivity/polarity.
+    """
+    spacy = import_spacy()
 
-    # Try to load the medium English model.
+    # Try to load the small English model without the unused components.
     try:
-        nlp = spacy.load("en_core_web_md")
+        nlp = spacy.load("en_core_web_sm", exclude=list(UNUSED_PIPES))
     except OSError:
-        sys.stderr.write("[fatal] Missing model 'en_core_web_md'.\n")
+        sys.stderr.write("[fatal] Missing model 'en_core_web_sm'.\n")
         raise
 
     # Add spaCyTextBlob to the pipeline for polarity/subjectivity.
@@ -98,6 +124,23 @@ def load_nlp():
     return nlp
 
 
+def load_vectors():
+    """
+    Load the medium 'en_core_web_md' model, whose word vectors drive the similarity demo.
+
+    Returns None (with a warning) if the model is not installed, so the demo can be
+    skipped instead of failing the whole run.
+    """
+    spacy = import_spacy()
+    try:
+        return spacy.load("en_core_web_md", exclude=list(UNUSED_PIPES))
+    except OSError:
+        sys.stderr.write(
+            "[warn] Model 'en_core_web_md' not installed; skipping the similarity demo.\n"
+        )
+        return None
+
+
 def resolve_csv_path() -> Path:
     """
     Resolve the reviews CSV location.
@@ -118,49 +161,37 @@ def resolve_csv_path() -> Path:
     )
 
 
-def preprocess_doc(nlp, text: str) -> str:
+def clean_doc(doc) -> str:
     """
     Lightweight text cleaning to produce a "cleaned" column for reference.
 
-    Steps:
-      - lowercasing & strip whitespace
-      - tokenize with spaCy
+    Steps (on a Doc the pipeline has already processed):
       - lemmatize terms where available
       - keep alphabetic tokens only
-      - drop stop words via spaCy's vocab
+      - drop stop words via the token's own is_stop flag
+      - lowercase
 
     Returns a single, space-joined string of cleaned tokens.
     """
-    # Make a Doc cheaply, just to normalize case and spacing.
-    doc = nlp.make_doc(str(text).strip().lower())
+    return " ".join(
+        (t.lemma_ or t.text).lower()
+        for t in doc
+        if t.is_alpha and not t.is_stop
+    )
 
-    # Re-run through pipeline tokenization so I can use lemmas and stopword flags.
-    tokens = [t.lemma_ if t.lemma_ else t.text for t in nlp(doc.text)]
 
-    # Keep only alphabetic terms that are not stop words.
-    kept = [t for t in tokens if t.isalpha() and not nlp.vocab[t].is_stop]
-    return " ".join(kept) if kept else ""
+LABELS = ["negative", "neutral", "positive"]
 
 
-def label_from_polarity(p: float, pos: float = 0.1, neg: float = -0.1) -> str:
+def labels_from_polarity(p: pd.Series, pos: float = 0.1, neg: float = -0.1) -> pd.Categorical:
     """
-    Map a continuous polarity score to a discrete sentiment label.
+    Map continuous polarity scores to discrete sentiment labels (>= pos is positive,
+    <= neg is negative, anything between is neutral). The whole column is labelled
+    in one NumPy pass and returned as a categorical so each row stores a small code.
     """
-    if p >= pos:
-        return "positive"
-    if p <= neg:
-        return "negative"
-    return "neutral"
-
-
-def score_review(nlp, text: str) -> tuple[float, float, str]:
-    
-    # Run sentiment on one review and return (polarity, subjectivity, label).
-    
-    doc = nlp(text)
-    pol = float(doc._.blob.polarity)
-    sub = float(doc._.blob.subjectivity)
-    return pol, sub, label_from_polarity(pol)
+    values = p.to_numpy()
+    labels = np.select([values >= pos, values <= neg], ["positive", "negative"], "neutral")
+    return pd.Categorical(labels, categories=LABELS)
 
 
 def score_series(nlp, s: pd.Series, sample: int | None = None) -> pd.DataFrame:
@@ -174,16 +205,53 @@ def score_series(nlp, s: pd.Series, sample: int | None = None) -> pd.DataFrame:
     if sample is not None and 0 < sample < len(data):
         data = data.sample(sample, random_state=42)
 
-    # Produce a "cleaned" companion column for inspection
-    cleaned = data.apply(lambda x: preprocess_doc(nlp, x))
+    # One batched pipeline pass per review: the same Doc gives the sentiment
+    # scores and the "cleaned" companion column.
+    # Plain Python lists avoid per-element Series boxing; the rows are filled
+    # in place and turned into a DataFrame with a single constructor call.
+    texts = data.tolist()
+    rows = [None] * len(texts)
+    unused = [name for name in UNUSED_PIPES if name in nlp.pipe_names]
+    with nlp.select_pipes(disable=unused):
+        docs = nlp.pipe(texts, batch_size=PIPE_BATCH_SIZE, n_process=PIPE_PROCESSES)
+        for i, doc in enumerate(docs):
+            # doc._.blob is a getter that builds a new TextBlob on every access
+            # (in this process, whatever PIPE_PROCESSES is), so bind it once
+            blob = doc._.blob
+            pol = float(blob.polarity)
+            sub = float(blob.subjectivity)
+            rows[i] = (texts[i], clean_doc(doc), pol, sub)
+
+    scored = pd.DataFrame.from_records(
+        rows, columns=["review", "cleaned", "polarity", "subjectivity"]
+    )
+    # Labels are assigned for all rows at once rather than inside the loop.
+    scored["label"] = labels_from_polarity(scored["polarity"])
+    return scored
 
-    # Compute sentiment per row and collect results.
-    rows = []
-    for raw, clean in zip(data, cleaned):
-        pol, sub, lab = score_review(nlp, raw)
-        rows.append((raw, clean, pol, sub, lab))
 
-    return pd.DataFrame(rows, columns=["review", "cleaned", "polarity", "subjectivity", "label"])
+def save_scored(df: pd.DataFrame, out_dir: Path) -> Path:
+    """
+    Persist the scored table and return the path written.
+
+    Parquet is columnar and binary: the categorical label column is stored as a
+    small dictionary and the review text is zstd-compressed, so it
+    writes and reloads far faster than CSV. Falls back to CSV if pyarrow is
+    not installed or SENTIMENT_OUTPUT=csv is set.
+    """
+    if ENV_OUTPUT_FORMAT != "csv":
+        try:
+            import pyarrow  # noqa: F401  (engine used by to_parquet)
+        except ModuleNotFoundError:
+            sys.stderr.write("[warn] pyarrow not installed; writing CSV instead of Parquet.\n")
+        else:
+            out_path = out_dir / "sentiment_scored.parquet"
+            df.to_parquet(out_path, compression="zstd", index=False)
+            return out_path
+
+    out_path = out_dir / "sentiment_scored.csv"
+    df.to_csv(out_path, index=False)
+    return out_path
 
 
 def quick_summary(df: pd.DataFrame) -> str:
@@ -200,16 +268,17 @@ def quick_summary(df: pd.DataFrame) -> str:
 
 def write_examples(df: pd.DataFrame, path: Path, k: int = 3) -> None:
     # Persist a few example snippets (top positive and top negative by polarity).
-    pos = df.sort_values("polarity", ascending=False).head(k)
-    neg = df.sort_values("polarity", ascending=True).head(k)
+    # nlargest/nsmallest select the k rows without sorting the whole table.
+    pos = df.nlargest(k, "polarity")
+    neg = df.nsmallest(k, "polarity")
 
     # Write short bullet points trimmed to 300 chars for readability.
     with open(path, "w", encoding="utf-8") as f:
         f.write("[Top positive examples]\n")
-        for r in pos["review"]:
+        for r in pos["review"].to_numpy():
             f.write(f"- {r[:300].strip()}\n\n")
         f.write("\n[Top negative examples]\n")
-        for r in neg["review"]:
+        for r in neg["review"].to_numpy():
             f.write(f"- {r[:300].strip()}\n\n")
 
 
@@ -235,13 +304,14 @@ def main():
     csv_path = resolve_csv_path()
     print(f"[info] Loading: {csv_path}")
 
-    #  Read CSV and check that the expected text column exists.
-    df = pd.read_csv(csv_path)
-    if COL_REVIEW not in df.columns:
+    #  Check the header for the expected text column, then read only that
+    #  column (as pandas strings) so the parser skips every other one.
+    if COL_REVIEW not in pd.read_csv(csv_path, nrows=0).columns:
         raise KeyError(f"Expected column '{COL_REVIEW}' not found.")
+    df = pd.read_csv(csv_path, usecols=[COL_REVIEW], dtype={COL_REVIEW: "string"})
 
     # Build NLP pipeline (spaCy + spaCyTextBlob).
-    nlp = load_nlp()
+    nlp = load_scorer()
 
     # Select the text column and drop missing values for clean processing.
     reviews = df[COL_REVIEW].dropna()
@@ -250,10 +320,9 @@ def main():
     # Score reviews → DataFrame with sentiment fields.
     scored = score_series(nlp, reviews, sample=None)
 
-    # Persist the scored table to CSV for downstream analysis.
-    out_csv = OUT_DIR / "sentiment_scored.csv"
-    scored.to_csv(out_csv, index=False)
-    print(f"[info] Saved: {out_csv}")
+    # Persist the scored table (Parquet, or CSV fallback) for downstream analysis.
+    out_path = save_scored(scored, OUT_DIR)
+    print(f"[info] Saved: {out_path}")
 
     # Print a compact summary (friendly for markers).
     print("\n" + quick_summary(scored) + "\n")
@@ -263,10 +332,13 @@ def main():
     write_examples(scored, examples_path, k=3)
     print(f"[info] Saved examples: {examples_path}")
 
-    # Save a tiny semantic similarity demo to show vector usage.
-    sim_path = OUT_DIR / "similarity_demo.txt"
-    similarity_demo(nlp, scored['review'].tolist(), sim_path)
-    print(f"[info] Saved similarity demo: {sim_path}")
+    # Save a tiny semantic similarity demo to show vector usage; the vector
+    # model is only loaded here, and only if it is installed.
+    vectors = load_vectors()
+    if vectors is not None:
+        sim_path = OUT_DIR / "similarity_demo.txt"
+        similarity_demo(vectors, scored['review'].tolist(), sim_path)
+        print(f"[info] Saved similarity demo: {sim_path}")
 
 
 if __name__ == "__main__":